@@ -50,3 +50,18 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     if user is None:
         raise credentials_exception
     return user
+
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login", auto_error=False)
+
+async def get_token_subject(token: Optional[str] = Depends(optional_oauth2_scheme)) -> Optional[str]:
+    """The verified subject of the bearer token, or None if there is no valid one.
+
+    Unlike get_current_user this never touches the database, so it is safe on
+    hot paths such as admission control.
+    """
+    if not token:
+        return None
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except JWTError:
+        return None
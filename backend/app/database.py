@@ -1,16 +1,124 @@
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 import os
 from app.models.models import Base
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 # Database URL - default to sqlite for local dev if postgre isn't ready
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./job_hunter_v3.db")
+# Optional read replica; defaults to the primary database
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL", DATABASE_URL)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# SQLite tuning, applied to every new connection
+SQLITE_TUNING = os.getenv("SQLITE_TUNING", "1") == "1"
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+# The page cache is per connection: with the default QueuePool (5 + 10 overflow)
+# on both the write and read engines, one worker can hold up to 30 connections,
+# so the worst case is 30 x SQLITE_CACHE_SIZE_KB (240 MiB at the default). Hot
+# pages are also served from the shared mmap region, which costs nothing extra.
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "8192"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+def sqlite_pragmas(read_only=False, tuned=SQLITE_TUNING):
+    """PRAGMA statements run on each new SQLite connection."""
+    pragmas = ["PRAGMA query_only = ON"] if read_only else []
+    if not tuned:
+        return pragmas
+    pragmas += [
+        f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}",
+        # Negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if not read_only:
+        # journal_mode is persistent in the file, so only the writer needs to set it
+        pragmas.append(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+        pragmas.append(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+    return pragmas
+
+def is_file_sqlite(url):
+    return url.startswith("sqlite") and ":memory:" not in url and url.rstrip("/") != "sqlite:"
+
+def make_engine(url, read_only=False, tuned=SQLITE_TUNING):
+    if not url.startswith("sqlite"):
+        return create_engine(url)
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    pragmas = sqlite_pragmas(read_only, tuned) if is_file_sqlite(url) else []
+    if pragmas:
+        @event.listens_for(engine, "connect")
+        def apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+    return engine
+
+engine = make_engine(DATABASE_URL)
+# On SQLite, reads get their own query_only pool so they never queue behind a
+# writer's connection; with WAL they don't block on an in-flight write either.
+# In-memory SQLite can't be shared across engines, and other backends only need
+# a second engine when READ_DATABASE_URL points at a replica.
+if READ_DATABASE_URL != DATABASE_URL or is_file_sqlite(DATABASE_URL):
+    read_engine = make_engine(READ_DATABASE_URL, read_only=True)
+else:
+    read_engine = engine
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Arbitrary key for pg_advisory_xact_lock, shared by every process running init_db
+MIGRATION_LOCK_KEY = 4207331
+
+@contextmanager
+def migration_lock(url=DATABASE_URL):
+    """Hold an exclusive lock on the SQLite file's sidecar lock file, if there is one.
+
+    SQLite DDL outside a transaction isn't serialized, so API workers and the
+    scheduler starting together would all try to create the same tables.
+    PostgreSQL is serialized with an advisory lock inside init_db instead.
+    """
+    if fcntl is None or not is_file_sqlite(url):
+        yield
+        return
+    with open(os.path.abspath(make_url(url).database) + ".migrate-lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def run_migrations(connection):
+    """Bring the database on ``connection`` up to the latest Alembic revision."""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    config.set_main_option("prepend_sys_path", BACKEND_DIR)
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    """Create missing tables and apply pending migrations, one process at a time.
+
+    Safe to call from every process at startup: the first one through the
+    lock does the work and the rest find the schema already at head.
+    """
+    with migration_lock(), engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        Base.metadata.create_all(bind=connection)
+        run_migrations(connection)
 
 def get_db():
     db = SessionLocal()
@@ -18,3 +126,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    """Like get_db, but for endpoints that only read (query_only on SQLite)."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,6 +1,8 @@
 import os
+import math
 import shutil
 import logging
+import hashlib
 from typing import List, Optional
 
 # Monkeypatch for passlib/bcrypt version issue
@@ -8,23 +10,35 @@ import bcrypt
 if not hasattr(bcrypt, "__about__"):
     bcrypt.__about__ = type("about", (object,), {"__version__": bcrypt.__version__})
 
-from fastapi import FastAPI, Depends, UploadFile, File, Form, HTTPException, status
+from fastapi import FastAPI, Depends, UploadFile, File, Form, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
 import pydantic
 from sqlalchemy.orm import Session
 import fitz  # PyMuPDF
 
-from app.services.matching_engine import MatchingEngine
+from app.services.matching_engine import matching_engine, CASCADE_CANDIDATES
 from app.services.job_service import job_service
-from app.services.cover_letter import cover_letter_generator
-from app.services.tailor_service import tailor_service
-from app.database import get_db, init_db
+from app.services.generation_service import generation_service
+from app.services.recommendation_service import recommendation_service
+from app.services.dedup_service import dedup_service
+from app.services.analytics_service import analytics_service, GRANULARITIES
+from app.services.admission import admission_control
+from app.services.single_flight import jobs_flight, match_flight
+from app.services.corpus_snapshot import corpus_snapshots
+from app.services.scheduled_tasks import register_tasks
+from app.services.scheduler import Scheduler, SCHEDULER_ENABLED
+from app.database import get_db, get_read_db, init_db, SessionLocal, ReadSessionLocal
 from app.models.models import User, Profile, Job
 from app.auth import get_password_hash, verify_password, create_access_token, get_current_user
+from app.responses import FastJSONResponse, add_compression
+from app.schemas import JobOut, MeOut, ProfileOut, RecommendationOut
 
 app = FastAPI(title="Smart Job Hunter API")
 
+add_compression(app)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -34,7 +48,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-engine = MatchingEngine()
+engine = matching_engine
+# Seconds a client should wait for the first corpus snapshot before retrying /recommendations
+RECOMMENDATIONS_RETRY_AFTER = int(os.getenv("RECOMMENDATIONS_RETRY_AFTER", "10"))
+scheduler = register_tasks(Scheduler(SessionLocal))
 
 class MatchRequest(pydantic.BaseModel):
     resume_text: str
@@ -56,6 +73,15 @@ class ProfileUpdate(pydantic.BaseModel):
     location_preference: str
     salary_expectation: str
 
+class BatchCoverLetterRequest(pydantic.BaseModel):
+    job_ids: List[int]
+    candidate_name: str
+    resume_text: str
+
+class BatchTailorRequest(pydantic.BaseModel):
+    job_ids: List[int]
+    resume_text: str
+
 class ApplicationCreate(pydantic.BaseModel):
     job_id: int
     status: str = "Applied"
@@ -65,28 +91,107 @@ class ApplicationCreate(pydantic.BaseModel):
 @app.on_event("startup")
 def on_startup():
     init_db()
+    # Maps the current corpus snapshot, if one has been published
+    corpus_snapshots.current()
+    if SCHEDULER_ENABLED:
+        scheduler.start()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    scheduler.stop()
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to Smart Job Hunter API", "status": "running"}
 
-@app.get("/jobs")
+@app.get("/metrics")
+async def get_metrics(db: Session = Depends(get_read_db)):
+    return {
+        "scheduler": scheduler.status(db),
+        "generation_cache": generation_service.cache.stats(),
+        "corpus_snapshot": corpus_snapshots.status(),
+        "coalescing": {"jobs": jobs_flight.stats(), "match": match_flight.stats()},
+        "dedup": dedup_service.stats(),
+        "admission": admission_control.stats()
+    }
+
+@app.get("/jobs", response_class=FastJSONResponse)
 async def get_jobs(
     location: Optional[str] = None, 
     remote_status: Optional[str] = None, 
     experience_level: Optional[str] = None,
     keywords: Optional[str] = None,
-    db: Session = Depends(get_db)
+    radius_km: Optional[float] = Query(None, gt=0, allow_inf_nan=False),
+    include_duplicates: bool = False
 ):
-    jobs = await job_service.get_jobs(db, location, remote_status, experience_level, keywords)
-    return jobs
+    def load_jobs():
+        # Uses its own session: the result is shared with every coalesced request
+        with ReadSessionLocal() as db:
+            query = job_service.build_jobs_query(
+                db, location, remote_status, experience_level, keywords, radius_km, include_duplicates
+            )
+            return [JobOut.from_orm(job) for job in query.all()]
+
+    # Identical concurrent searches share one query
+    key = job_service.filters_key(location, remote_status, experience_level, keywords, radius_km, include_duplicates)
+    jobs = await jobs_flight.do(key, lambda: run_in_threadpool(load_jobs))
+    return FastJSONResponse(jobs)
 
 @app.post("/match")
-async def match_resume(resume_text: str = Form(...), job_id: int = Form(...), db: Session = Depends(get_db)):
+async def match_resume(
+    resume_text: str = Form(...),
+    job_id: int = Form(...),
+    db: Session = Depends(get_read_db),
+    admission_key: str = Depends(admission_control.limit("match"))
+):
     job = await job_service.get_job_by_id(db, job_id)
     if not job:
         return {"error": "Job not found"}
-        
+    # Don't hold a pooled connection across the await: releasing it would need
+    # the event loop, and once the pool drains the next checkout blocks the loop
+    db.close()
+
+    # Identical concurrent matches (e.g. a double-mounted Matches page) share one scoring run
+    key = (hashlib.sha256(resume_text.encode("utf-8")).hexdigest(), job.id)
+    return await match_flight.do(key, lambda: run_in_threadpool(score_match, resume_text, job))
+
+@app.get("/recommendations", response_class=FastJSONResponse)
+async def get_recommendations(
+    top_k: int = Query(10, ge=1, le=50),
+    candidates: Optional[int] = Query(None, ge=1, le=500),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    admission_key: str = Depends(admission_control.limit("match"))
+):
+    # One token per CASCADE_CANDIDATES jobs fully scored; the dependency already took the first
+    candidate_k = max(candidates or CASCADE_CANDIDATES, top_k)
+    admission_control.charge("match", admission_key, math.ceil(candidate_k / CASCADE_CANDIDATES), paid=1)
+    profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
+    if not profile or not profile.resume_text:
+        return FastJSONResponse([])
+    resume_text = profile.resume_text
+    # Ranking runs on its own read session; hand this connection back first (see match_resume)
+    db.close()
+
+    def recommend():
+        with ReadSessionLocal() as session:
+            ranked = recommendation_service.recommend(session, resume_text, top_k, candidate_k)
+            if ranked is None:
+                return None
+            return [RecommendationOut.from_match(job, score) for job, score in ranked]
+
+    key = ("recommendations", hashlib.sha256(resume_text.encode("utf-8")).hexdigest(), top_k, candidate_k)
+    recommendations = await match_flight.do(key, lambda: run_in_threadpool(recommend))
+    if recommendations is None:
+        # The scheduler publishes the first snapshot shortly after startup
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Recommendations are not ready yet",
+            headers={"Retry-After": str(RECOMMENDATIONS_RETRY_AFTER)},
+        )
+    return FastJSONResponse(recommendations)
+
+def score_match(resume_text, job):
     # Combine job skills and description for better matching
     job_content = f"{job.skills_required} {job.description}"
     
@@ -108,44 +213,66 @@ async def generate_cover_letter_api(
     job_id: int = Form(...),
     candidate_name: str = Form(...),
     resume_text: str = Form(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db),
+    admission_key: str = Depends(admission_control.limit("generation"))
 ):
     job = await job_service.get_job_by_id(db, job_id)
     if not job:
         return {"error": "Job not found"}
+    db.close()
     
-    skills = engine.extract_skills(resume_text)
-    letter = cover_letter_generator.generate(
-        job.title, job.company, job.description, candidate_name, skills
+    # spaCy extraction is CPU-bound; keep it off the event loop
+    result = (await run_in_threadpool(generation_service.cover_letters, [job], resume_text, candidate_name))[0]
+    return {"cover_letter": result["cover_letter"]}
+
+@app.post("/generate-cover-letter/batch")
+async def generate_cover_letter_batch_api(
+    request: BatchCoverLetterRequest,
+    db: Session = Depends(get_read_db),
+    admission_key: str = Depends(admission_control.limit("generation"))
+):
+    # One token per distinct job; the dependency already took the first
+    admission_control.charge("generation", admission_key, len(set(request.job_ids)), paid=1)
+    jobs = await job_service.get_jobs_by_ids(db, request.job_ids)
+    db.close()
+    results = await run_in_threadpool(
+        generation_service.cover_letters, list(jobs.values()), request.resume_text, request.candidate_name
     )
-    return {"cover_letter": letter}
+    letters = {result["job_id"]: result for result in results}
+    return [letters.get(job_id, {"job_id": job_id, "error": "Job not found"}) for job_id in request.job_ids]
 
 @app.post("/tailor-resume")
 async def tailor_resume_api(
     job_id: int = Form(...),
     resume_text: str = Form(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db),
+    admission_key: str = Depends(admission_control.limit("generation"))
 ):
     job = await job_service.get_job_by_id(db, job_id)
     if not job:
         return {"error": "Job not found"}
+    db.close()
     
-    # Extract skills for precise tailoring
-    job_skills = engine.extract_skills(job.description)
-    resume_skills = engine.extract_skills(resume_text)
-    
-    missing_skills = list(set(job_skills) - set(resume_skills))
-    
-    suggestions = tailor_service.generate_suggestions(
-        resume_text, job.title, missing_skills
-    )
-    
+    result = (await run_in_threadpool(generation_service.tailor, [job], resume_text))[0]
     return {
-        "job_title": job.title,
-        "company": job.company,
-        "suggestions": suggestions
+        "job_title": result["job_title"],
+        "company": result["company"],
+        "suggestions": result["suggestions"]
     }
 
+@app.post("/tailor-resume/batch")
+async def tailor_resume_batch_api(
+    request: BatchTailorRequest,
+    db: Session = Depends(get_read_db),
+    admission_key: str = Depends(admission_control.limit("generation"))
+):
+    admission_control.charge("generation", admission_key, len(set(request.job_ids)), paid=1)
+    jobs = await job_service.get_jobs_by_ids(db, request.job_ids)
+    db.close()
+    results = await run_in_threadpool(generation_service.tailor, list(jobs.values()), request.resume_text)
+    suggestions = {result["job_id"]: result for result in results}
+    return [suggestions.get(job_id, {"job_id": job_id, "error": "Job not found"}) for job_id in request.job_ids]
+
 # --- Auth Endpoints ---
 
 @app.post("/register", response_model=Token)
@@ -181,7 +308,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     access_token = create_access_token(data={"sub": user.email})
     return {"access_token": access_token, "token_type": "bearer"}
 
-@app.get("/me")
+@app.get("/me", response_class=FastJSONResponse)
 async def get_me(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
     logging.info(f"Fetch /me: user_id={current_user.id}, profile_found={profile is not None}")
@@ -189,19 +316,13 @@ async def get_me(current_user: User = Depends(get_current_user), db: Session = D
     # Ensure full_name is at least an empty string
     name = current_user.full_name or "Professional Hunter"
     
-    return {
-        "id": current_user.id,
-        "email": current_user.email,
-        "full_name": name,
-        "is_profile_complete": current_user.is_profile_complete == 1,
-        "profile": {
-            "preferred_role": profile.preferred_role if profile else None,
-            "skills": profile.skills if profile else None,
-            "experience_level": profile.experience_level if profile else None,
-            "has_resume": bool(profile.resume_path) if profile else False,
-            "resume_text": profile.resume_text if profile else None
-        } if profile else None
-    }
+    return FastJSONResponse(MeOut(
+        id=current_user.id,
+        email=current_user.email,
+        full_name=name,
+        is_profile_complete=current_user.is_profile_complete == 1,
+        profile=ProfileOut.from_orm(profile) if profile else None
+    ))
 
 @app.post("/profile")
 async def update_profile(
@@ -253,7 +374,8 @@ def extract_text(file_path: str) -> str:
 async def upload_resume(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    admission_key: str = Depends(admission_control.limit("upload"))
 ):
     profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
     if not profile:
@@ -310,6 +432,7 @@ async def create_application(app_data: ApplicationCreate, current_user: User = D
     ).first()
     
     if existing:
+        analytics_service.record_status_change(db, current_user.id, existing.status, app_data.status)
         existing.status = app_data.status
         db.commit()
         return {"message": "Application updated"}
@@ -323,9 +446,21 @@ async def create_application(app_data: ApplicationCreate, current_user: User = D
         applied_at=datetime.datetime.utcnow()
     )
     db.add(new_app)
+    analytics_service.record_application(db, current_user.id, app_data.status, app_data.match_score, new_app.applied_at)
     db.commit()
     return {"message": "Application tracked successfully"}
 
+@app.get("/analytics")
+async def get_analytics(
+    granularity: str = "week",
+    limit: int = 12,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity must be one of {', '.join(GRANULARITIES)}")
+    return analytics_service.get_analytics(db, current_user.id, granularity, max(1, min(limit, 366)))
+
 if __name__ == "__main__":
     import uvicorn
     # Use string reference to allow for potential reload support if run directly
@@ -1,9 +1,11 @@
-from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, DateTime, Date, Enum, Index, UniqueConstraint, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 import datetime
 import enum
 
+from app.services.location_service import normalize_location, parse_location
+
 Base = declarative_base()
 
 class ApplicationStatus(enum.Enum):
@@ -39,16 +41,52 @@ User.profile = relationship("Profile", back_populates="user", uselist=False)
 
 class Job(Base):
     __tablename__ = "jobs"
+    # Composite indexes mirror the filter combinations used by JobService.get_jobs,
+    # each ending in posted_at so results come back already ordered.
+    __table_args__ = (
+        Index("ix_jobs_posted_at", "posted_at"),
+        Index("ix_jobs_location_normalized_posted_at", "location_normalized", "posted_at"),
+        Index("ix_jobs_city_posted_at", "city", "posted_at"),
+        Index("ix_jobs_region_posted_at", "region", "posted_at"),
+        Index("ix_jobs_country_posted_at", "country", "posted_at"),
+        # Unfiltered listings of canonical jobs (duplicate_of IS NULL) walk this in order
+        Index("ix_jobs_duplicate_of_posted_at", "duplicate_of", "posted_at"),
+        Index("ix_jobs_remote_status_posted_at", "remote_status", "posted_at"),
+        Index("ix_jobs_experience_level_posted_at", "experience_level", "posted_at"),
+        Index("ix_jobs_remote_status_experience_level_posted_at", "remote_status", "experience_level", "posted_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
     company = Column(String, index=True)
     location = Column(String)
+    location_normalized = Column(String)  # Maintained from location, see normalize_location
+    # Structured fields parsed from location at ingestion, see parse_location
+    city = Column(String, nullable=True)
+    region = Column(String, nullable=True)
+    country = Column(String, nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
     description = Column(Text)
     remote_status = Column(String)  # "Remote", "On-site", "Hybrid"
     experience_level = Column(String)
     skills_required = Column(Text)  # Comma separated or JSON
     salary_range = Column(String, nullable=True)
     posted_at = Column(DateTime, default=datetime.datetime.utcnow)
+    # Near-duplicate detection, see app/services/dedup_service.py
+    minhash = Column(LargeBinary, nullable=True)
+    duplicate_of = Column(Integer, ForeignKey("jobs.id"), nullable=True)  # Canonical posting, NULL if canonical
+
+    @validates("location")
+    def _sync_location_fields(self, key, value):
+        self.location_normalized = normalize_location(value)
+        parsed = parse_location(value)
+        self.city = parsed.city
+        self.region = parsed.region
+        self.country = parsed.country
+        self.latitude = parsed.latitude
+        self.longitude = parsed.longitude
+        return value
 
 class Resume(Base):
     __tablename__ = "resumes"
@@ -62,6 +100,10 @@ class Resume(Base):
 
 class ApplicationTracker(Base):
     __tablename__ = "application_tracker"
+    __table_args__ = (
+        Index("ix_application_tracker_user_id_job_id", "user_id", "job_id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     job_id = Column(Integer, ForeignKey("jobs.id"))
@@ -72,3 +114,70 @@ class ApplicationTracker(Base):
 
     user = relationship("User")
     job = relationship("Job")
+
+class ApplicationStatusCount(Base):
+    """Per-user count of applications in each status, maintained by analytics_service."""
+    __tablename__ = "application_status_counts"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    status = Column(String, primary_key=True)
+    count = Column(Integer, default=0)
+
+class ApplicationRollup(Base):
+    """Per-user applications and match scores per day/week/month bucket of applied_at."""
+    __tablename__ = "application_rollups"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    granularity = Column(String, primary_key=True)  # "day", "week" or "month"
+    bucket_start = Column(Date, primary_key=True)
+    applications = Column(Integer, default=0)
+    score_sum = Column(Float, default=0.0)
+    score_count = Column(Integer, default=0)
+
+class MatchAlert(Base):
+    """A job scoring at or above the alert threshold for a user, found by the scheduler."""
+    __tablename__ = "match_alerts"
+    __table_args__ = (
+        UniqueConstraint("user_id", "job_id", name="uq_match_alerts_user_id_job_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    job_id = Column(Integer, ForeignKey("jobs.id"))
+    match_score = Column(Float)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    notified_at = Column(DateTime, nullable=True)
+
+class MatchScore(Base):
+    """Offline (user, job) match score, written in bulk by rescore_matches.py."""
+    __tablename__ = "match_scores"
+    __table_args__ = (
+        UniqueConstraint("user_id", "job_id", "formula_version", name="uq_match_scores_user_id_job_id_formula_version"),
+        Index("ix_match_scores_formula_version_job_id", "formula_version", "job_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    job_id = Column(Integer, ForeignKey("jobs.id"))
+    score = Column(Float)
+    formula_version = Column(String)  # SCORING_VERSION the score was computed with
+    scored_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+class ScheduledTask(Base):
+    """Durable state for a periodic background task, see app/services/scheduler.py."""
+    __tablename__ = "scheduled_tasks"
+    name = Column(String, primary_key=True)
+    interval_seconds = Column(Integer)
+    next_run_at = Column(DateTime, index=True)
+    cursor = Column(String, nullable=True)  # Task-specific progress marker, e.g. last processed job id
+    last_started_at = Column(DateTime, nullable=True)
+    last_finished_at = Column(DateTime, nullable=True)
+    last_duration_ms = Column(Float, nullable=True)
+    last_error = Column(Text, nullable=True)
+    run_count = Column(Integer, default=0)
+    failure_count = Column(Integer, default=0)
+
+class SchedulerLease(Base):
+    """Leader election row: only the holder of an unexpired lease runs tasks."""
+    __tablename__ = "scheduler_leases"
+    name = Column(String, primary_key=True)
+    holder = Column(String)
+    expires_at = Column(DateTime)
@@ -0,0 +1,85 @@
+"""Explicit response projections.
+
+Endpoints that return large payloads build these instead of handing ORM
+objects to FastAPI's ``jsonable_encoder``. Dataclasses with slots are cheap
+to construct and are serialized natively by orjson.
+"""
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(slots=True)
+class JobOut:
+    id: int
+    title: str
+    company: str
+    location: Optional[str]
+    description: Optional[str]
+    remote_status: Optional[str]
+    experience_level: Optional[str]
+    skills_required: Optional[str]
+    salary_range: Optional[str]
+    posted_at: Optional[datetime]
+
+    @classmethod
+    def from_orm(cls, job) -> "JobOut":
+        return cls(
+            id=job.id,
+            title=job.title,
+            company=job.company,
+            location=job.location,
+            description=job.description,
+            remote_status=job.remote_status,
+            experience_level=job.experience_level,
+            skills_required=job.skills_required,
+            salary_range=job.salary_range,
+            posted_at=job.posted_at,
+        )
+
+
+@dataclass(slots=True)
+class RecommendationOut(JobOut):
+    match_percentage: float
+
+    @classmethod
+    def from_match(cls, job, match_percentage) -> "RecommendationOut":
+        return cls(**{field: getattr(job, field) for field in JobOut.__dataclass_fields__},
+                   match_percentage=match_percentage)
+
+
+@dataclass(slots=True)
+class ProfileOut:
+    preferred_role: Optional[str]
+    skills: Optional[str]
+    experience_level: Optional[str]
+    has_resume: bool
+    resume_text: Optional[str]
+
+    @classmethod
+    def from_orm(cls, profile) -> "ProfileOut":
+        return cls(
+            preferred_role=profile.preferred_role,
+            skills=profile.skills,
+            experience_level=profile.experience_level,
+            has_resume=bool(profile.resume_path),
+            resume_text=profile.resume_text,
+        )
+
+
+@dataclass(slots=True)
+class MeOut:
+    id: int
+    email: str
+    full_name: str
+    is_profile_complete: bool
+    profile: Optional[ProfileOut]
+
+
+def to_builtins(obj):
+    """Fallback conversion used when orjson is not installed."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if hasattr(obj, "__dataclass_fields__"):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,230 @@
+"""Admission control for the expensive endpoints.
+
+Two independent checks run before a request reaches its handler:
+
+* a per-client token bucket (keyed on the bearer token's subject, falling
+  back to the client IP) that rejects with 429 once a client outruns its rate;
+* a per-process concurrency cap per endpoint class that sheds load with 503
+  instead of letting requests queue behind the NLP path without bound.
+
+Both set Retry-After. Buckets live in-process by default; set
+ADMISSION_REDIS_URL (and install ``redis``) to share them across workers.
+Concurrency caps stay per process since they protect this process's CPU.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.auth import get_token_subject
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1") == "1"
+ADMISSION_REDIS_URL = os.getenv("ADMISSION_REDIS_URL")
+# Idle in-process buckets beyond this many are evicted, oldest first
+ADMISSION_MAX_BUCKETS = int(os.getenv("ADMISSION_MAX_BUCKETS", "10000"))
+
+
+@dataclass(frozen=True)
+class EndpointLimits:
+    rate: float          # tokens refilled per second, per client
+    burst: int           # bucket capacity
+    concurrency: int     # in-flight requests per process
+
+
+def _limits(name, rate, burst, concurrency):
+    prefix = f"ADMISSION_{name.upper()}"
+    return EndpointLimits(
+        rate=float(os.getenv(f"{prefix}_RATE", str(rate))),
+        burst=int(os.getenv(f"{prefix}_BURST", str(burst))),
+        concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", str(concurrency))),
+    )
+
+
+# A Matches visit costs 4 match tokens (/recommendations plus /match for the 3
+# cards shown), so the burst covers many visits and Dashboard clicks in a row
+ENDPOINT_LIMITS = {
+    "match": _limits("match", rate=5, burst=60, concurrency=16),
+    "upload": _limits("upload", rate=0.2, burst=3, concurrency=4),
+    "generation": _limits("generation", rate=1, burst=20, concurrency=8),
+}
+
+
+class LocalBuckets:
+    """Token buckets in this process's memory."""
+
+    def __init__(self, max_buckets=ADMISSION_MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def take(self, key, limits: EndpointLimits, cost):
+        """Consume ``cost`` tokens; return 0 on success, else seconds until they are available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (limits.burst, now))
+            tokens = min(limits.burst, tokens + (now - updated_at) * limits.rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / limits.rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisBuckets:
+    """Token buckets shared by every worker through Redis (one Lua call per check)."""
+
+    SCRIPT = """
+    local now_parts = redis.call('TIME')
+    local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+    local rate, burst, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local wait = 0
+    if tokens >= cost then tokens = tokens - cost else wait = (cost - tokens) / rate end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url):
+        self.client = redis.Redis.from_url(url)
+        self._take = self.client.register_script(self.SCRIPT)
+
+    def take(self, key, limits: EndpointLimits, cost):
+        return float(self._take(keys=[f"admission:{key}"], args=[limits.rate, limits.burst, cost]))
+
+    def clear(self):
+        for key in self.client.scan_iter("admission:*"):
+            self.client.delete(key)
+
+
+class AdmissionController:
+    def __init__(self, limits=None, buckets=None, enabled=ADMISSION_ENABLED):
+        self.limits = limits or ENDPOINT_LIMITS
+        self.buckets = buckets or LocalBuckets()
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._in_flight = {name: 0 for name in self.limits}
+        self._counters = {name: {"admitted": 0, "rate_limited": 0, "overloaded": 0, "backend_errors": 0}
+                          for name in self.limits}
+
+    @staticmethod
+    def client_key(request: Request, subject: Optional[str]):
+        if subject is not None:
+            return f"user:{subject}"
+        return f"ip:{request.client.host if request.client else 'unknown'}"
+
+    def _count(self, endpoint_class, counter):
+        with self._lock:
+            self._counters[endpoint_class][counter] += 1
+
+    def charge(self, endpoint_class, key, cost=1, paid=0):
+        """Take ``cost`` tokens (less ``paid`` already taken) from ``key``'s bucket or raise 429.
+
+        A cost the bucket could never hold is a 400 rather than an endless 429.
+        """
+        if not self.enabled or cost - paid <= 0:
+            return
+        limits = self.limits[endpoint_class]
+        if cost > limits.burst:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {limits.burst} {endpoint_class} items per request",
+            )
+        try:
+            wait = self.buckets.take(f"{endpoint_class}:{key}", limits, cost - paid)
+        except Exception:
+            # Fail open: a shared-backend outage shouldn't take the endpoints down with it
+            logging.exception("Admission backend unavailable; admitting %s", key)
+            self._count(endpoint_class, "backend_errors")
+            return
+        if wait > 0:
+            self._count(endpoint_class, "rate_limited")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded for {endpoint_class} requests",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+
+    def _enter(self, endpoint_class):
+        with self._lock:
+            if self._in_flight[endpoint_class] >= self.limits[endpoint_class].concurrency:
+                self._counters[endpoint_class]["overloaded"] += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"Too many concurrent {endpoint_class} requests",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight[endpoint_class] += 1
+
+    def _exit(self, endpoint_class):
+        with self._lock:
+            self._in_flight[endpoint_class] -= 1
+
+    def limit(self, endpoint_class):
+        """FastAPI dependency: rate-limit the caller and hold a concurrency slot for the request.
+
+        Yields the caller's bucket key so handlers can ``charge`` extra tokens
+        (e.g. one per job in a batch).
+        """
+        if endpoint_class not in self.limits:
+            raise ValueError(f"Unknown endpoint class: {endpoint_class}")
+
+        # Keyed on the token alone: a user lookup here would hold a pooled
+        # connection for the whole request on top of the endpoint's own
+        async def dependency(request: Request, subject: Optional[str] = Depends(get_token_subject)):
+            key = self.client_key(request, subject)
+            if not self.enabled:
+                yield key
+                return
+            # Take the slot first so requests shed with 503 don't also spend tokens
+            self._enter(endpoint_class)
+            try:
+                self.charge(endpoint_class, key)
+                self._count(endpoint_class, "admitted")
+                yield key
+            finally:
+                self._exit(endpoint_class)
+
+        return dependency
+
+    def stats(self):
+        with self._lock:
+            endpoints = {
+                name: {**self._counters[name], "in_flight": self._in_flight[name],
+                       "rate": limits.rate, "burst": limits.burst, "concurrency": limits.concurrency}
+                for name, limits in self.limits.items()
+            }
+        return {"enabled": self.enabled, "backend": type(self.buckets).__name__, "endpoints": endpoints}
+
+
+def _default_buckets():
+    if ADMISSION_REDIS_URL:
+        if redis is not None:
+            return RedisBuckets(ADMISSION_REDIS_URL)
+        logging.warning("ADMISSION_REDIS_URL is set but redis is not installed; using in-process buckets")
+    return LocalBuckets()
+
+
+admission_control = AdmissionController(buckets=_default_buckets())
@@ -0,0 +1,122 @@
+import datetime
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.models.models import ApplicationTracker, ApplicationStatus, ApplicationStatusCount, ApplicationRollup
+
+GRANULARITIES = ("day", "week", "month")
+
+def status_value(status):
+    return status.value if hasattr(status, "value") else status
+
+def bucket_start(moment, granularity) -> datetime.date:
+    day = moment.date() if isinstance(moment, datetime.datetime) else moment
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - datetime.timedelta(days=day.weekday())  # Monday
+    if granularity == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+class AnalyticsService:
+    """Incrementally maintained application rollups for the dashboard.
+
+    The record_* methods only stage changes on the session; call them before
+    the caller's commit so rollups and applications change in one transaction.
+    Reads then cost O(buckets) rather than O(applications).
+    """
+
+    def _increment(self, db: Session, model, keys: dict, **deltas):
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            # Upsert so concurrent first writes to a bucket can't collide
+            statement = insert(model).values(**keys, **deltas)
+            statement = statement.on_conflict_do_update(
+                index_elements=list(keys),
+                set_={name: getattr(model, name) + statement.excluded[name] for name in deltas},
+            )
+            db.execute(statement)
+            return
+        row = db.get(model, tuple(keys.values()))
+        if row is None:
+            db.add(model(**keys, **deltas))
+            db.flush()
+        else:
+            for name, delta in deltas.items():
+                setattr(row, name, (getattr(row, name) or 0) + delta)
+
+    def record_application(self, db: Session, user_id: int, status, match_score: Optional[float],
+                           applied_at: datetime.datetime):
+        self._increment(db, ApplicationStatusCount, {"user_id": user_id, "status": status_value(status)}, count=1)
+        for granularity in GRANULARITIES:
+            self._increment(
+                db, ApplicationRollup,
+                {"user_id": user_id, "granularity": granularity, "bucket_start": bucket_start(applied_at, granularity)},
+                applications=1,
+                score_sum=match_score or 0.0,
+                score_count=int(match_score is not None),
+            )
+
+    def record_status_change(self, db: Session, user_id: int, old_status, new_status):
+        old_status, new_status = status_value(old_status), status_value(new_status)
+        if old_status == new_status:
+            return
+        self._increment(db, ApplicationStatusCount, {"user_id": user_id, "status": old_status}, count=-1)
+        self._increment(db, ApplicationStatusCount, {"user_id": user_id, "status": new_status}, count=1)
+
+    def rebuild(self, db: Session, user_id: Optional[int] = None):
+        """Recompute rollups from application_tracker, e.g. after a backfill."""
+        for model in (ApplicationStatusCount, ApplicationRollup):
+            query = db.query(model)
+            if user_id is not None:
+                query = query.filter(model.user_id == user_id)
+            query.delete(synchronize_session=False)
+
+        query = db.query(ApplicationTracker.user_id, ApplicationTracker.status,
+                         ApplicationTracker.match_score, ApplicationTracker.applied_at)
+        if user_id is not None:
+            query = query.filter(ApplicationTracker.user_id == user_id)
+        for app_user_id, status, match_score, applied_at in query.yield_per(1000):
+            self.record_application(db, app_user_id, status, match_score,
+                                    applied_at or datetime.datetime.utcnow())
+        db.commit()
+
+    def get_analytics(self, db: Session, user_id: int, granularity: str = "week", limit: int = 12):
+        counts = {status.value: 0 for status in ApplicationStatus}
+        for status, count in db.query(ApplicationStatusCount.status, ApplicationStatusCount.count).filter(
+                ApplicationStatusCount.user_id == user_id).all():
+            counts[status] = count
+
+        buckets = db.query(ApplicationRollup).filter(
+            ApplicationRollup.user_id == user_id,
+            ApplicationRollup.granularity == granularity
+        ).order_by(ApplicationRollup.bucket_start.desc()).limit(limit).all()
+        series = [{
+            "bucket": bucket.bucket_start.isoformat(),
+            "applications": bucket.applications,
+            "avg_match_score": round(bucket.score_sum / bucket.score_count, 2) if bucket.score_count else None
+        } for bucket in reversed(buckets)]
+
+        # Funnel from current statuses: an offer implies an interview; rejections
+        # count as applied but not as reaching a later stage.
+        offer = counts[ApplicationStatus.OFFER.value]
+        interview = counts[ApplicationStatus.INTERVIEW.value] + offer
+        applied = interview + counts[ApplicationStatus.APPLIED.value] + counts[ApplicationStatus.REJECTED.value]
+        return {
+            "granularity": granularity,
+            "status_counts": counts,
+            "series": series,
+            "funnel": {
+                "applied": applied,
+                "interview": interview,
+                "offer": offer,
+                "applied_to_interview": round(interview / applied, 4) if applied else 0.0,
+                "interview_to_offer": round(offer / interview, 4) if interview else 0.0
+            }
+        }
+
+analytics_service = AnalyticsService()
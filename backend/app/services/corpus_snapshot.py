@@ -0,0 +1,219 @@
+"""Versioned, memory-mapped snapshot of the job corpus.
+
+A snapshot is a directory of flat ``.npy`` arrays plus ``manifest.json``::
+
+    snapshots/
+        CURRENT                 name of the active snapshot directory
+        v1760000000-1234/
+            manifest.json       format version and counts only
+            job_ids.npy         int64[n], sorted
+            tfidf_indptr.npy    int64[n + 1]  \\
+            tfidf_indices.npy   int32[nnz]     > CSR matrix of job TF-IDF vectors over hashed terms
+            tfidf_data.npy      float32[nnz]  /
+            idf.npy             float32[CORPUS_HASH_FEATURES]
+            skill_bits.npy      uint64[n, words], bit i set = SKILL_VOCABULARY[i]
+            skill_counts.npy    uint16[n], dictionary skills per job
+
+Readers open the arrays with ``numpy.load(mmap_mode="r")``, so every uvicorn
+worker shares one copy through the page cache and opening is near-instant.
+Terms are hashed (matching_engine.corpus_hasher), so there is no vocabulary
+for each worker to load into its own heap.
+Builders write a new directory and then atomically replace ``CURRENT``;
+readers notice the change and switch on their next access.
+"""
+import datetime
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.preprocessing import normalize
+
+from app.models.models import Job
+from app.services.matching_engine import SKILL_VOCABULARY, CORPUS_HASH_FEATURES, corpus_hasher
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "snapshots")
+SNAPSHOT_KEEP = int(os.getenv("SNAPSHOT_KEEP", "3"))
+FORMAT_VERSION = 4
+CURRENT_FILE = "CURRENT"
+
+SKILL_INDEX = {skill: i for i, skill in enumerate(SKILL_VOCABULARY)}
+SKILL_WORDS = (len(SKILL_VOCABULARY) + 63) // 64
+
+logger = logging.getLogger(__name__)
+
+
+def popcount(words):
+    """Set bits per row of a uint64 [n, words] array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    return np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+
+def skill_bitset(skills):
+    bits = np.zeros(SKILL_WORDS, dtype=np.uint64)
+    for skill in skills:
+        i = SKILL_INDEX.get(skill)
+        if i is not None:
+            bits[i // 64] |= np.uint64(1) << np.uint64(i % 64)
+    return bits
+
+
+def build_snapshot(db, engine, root=SNAPSHOT_DIR):
+    """Build a snapshot of every job and make it current. Returns its name.
+
+    Reposts are included so a repost that outscores its canonical posting can
+    still be recommended; callers collapse clusters after ranking.
+    """
+    rows = db.query(Job.id, Job.skills_required, Job.description).order_by(Job.id).all()
+    documents = [f"{skills} {description}" for _, skills, description in rows]
+
+    if rows:
+        idf, matrix = engine.fit_corpus(documents)
+        matrix = matrix.tocsr()
+    else:
+        idf, matrix = np.ones(CORPUS_HASH_FEATURES), csr_matrix((0, CORPUS_HASH_FEATURES), dtype=np.float32)
+
+    skill_bits = np.zeros((len(rows), SKILL_WORDS), dtype=np.uint64)
+    for row, document in enumerate(documents):
+        skill_bits[row] = skill_bitset(engine.dictionary_skills(document))
+
+    arrays = {
+        "job_ids": np.array([r[0] for r in rows], dtype=np.int64),
+        "tfidf_indptr": matrix.indptr.astype(np.int64),
+        "tfidf_indices": matrix.indices.astype(np.int32),
+        "tfidf_data": matrix.data.astype(np.float32),
+        "idf": np.asarray(idf, dtype=np.float32),
+        "skill_bits": skill_bits,
+        "skill_counts": popcount(skill_bits).astype(np.uint16),
+    }
+
+    name = f"v{int(time.time())}-{len(rows)}-{uuid.uuid4().hex[:6]}"
+    os.makedirs(root, exist_ok=True)
+    staging = os.path.join(root, f".tmp-{name}")
+    os.makedirs(staging)
+    for key, array in arrays.items():
+        np.save(os.path.join(staging, f"{key}.npy"), array)
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "name": name,
+        "created_at": datetime.datetime.utcnow().isoformat(),
+        "num_jobs": len(rows),
+        "num_features": CORPUS_HASH_FEATURES,
+        "num_skills": len(SKILL_VOCABULARY),
+    }
+    with open(os.path.join(staging, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.rename(staging, os.path.join(root, name))
+
+    pointer = os.path.join(root, f".{CURRENT_FILE}.{uuid.uuid4().hex[:6]}")
+    with open(pointer, "w", encoding="utf-8") as f:
+        f.write(name)
+    os.replace(pointer, os.path.join(root, CURRENT_FILE))
+
+    _prune(root, keep=SNAPSHOT_KEEP)
+    logger.info("Built corpus snapshot %s (%d jobs, %d non-zero TF-IDF entries)", name, len(rows), matrix.nnz)
+    return name
+
+
+def _prune(root, keep):
+    snapshots = sorted(
+        (d for d in os.listdir(root) if d.startswith("v") and os.path.isdir(os.path.join(root, d))),
+        key=lambda d: os.path.getmtime(os.path.join(root, d)),
+    )
+    for name in snapshots[:-keep]:
+        # Workers that still map the old files keep their pages until they switch
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+class CorpusSnapshot:
+    """Read-only view over one snapshot directory; all arrays are memory-mapped."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format {self.manifest['format_version']}")
+        self.name = self.manifest["name"]
+        for key in ("job_ids", "tfidf_indptr", "tfidf_indices", "tfidf_data", "idf", "skill_bits", "skill_counts"):
+            setattr(self, key, np.load(os.path.join(path, f"{key}.npy"), mmap_mode="r"))
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def skill_overlap_counts(self, skills):
+        """Number of ``skills`` each job requires, for every job at once."""
+        return popcount(np.bitwise_and(self.skill_bits, skill_bitset(skills)))
+
+    def tfidf_matrix(self):
+        return csr_matrix(
+            (self.tfidf_data, self.tfidf_indices, self.tfidf_indptr),
+            shape=(len(self.job_ids), self.manifest["num_features"]),
+            copy=False,
+        )
+
+    def content_similarities(self, processed_text):
+        """Cosine similarity of already-preprocessed text against every job."""
+        if not len(self.job_ids):
+            return np.zeros(0)
+        counts = corpus_hasher().transform([processed_text])
+        vector = normalize(csr_matrix(counts.multiply(self.idf)))
+        return np.asarray((self.tfidf_matrix() @ vector.T).todense()).ravel()
+
+
+class SnapshotStore:
+    """Tracks ``CURRENT`` and swaps in new snapshots as they are published."""
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.root = root
+        self._snapshot = None
+        self._pointer_mtime = None
+        self._lock = threading.Lock()
+
+    def current(self):
+        """The active snapshot, or None if none has been built yet."""
+        pointer = os.path.join(self.root, CURRENT_FILE)
+        try:
+            mtime = os.stat(pointer).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if mtime == self._pointer_mtime:
+            return self._snapshot
+        with self._lock:
+            if mtime != self._pointer_mtime:
+                try:
+                    with open(pointer, encoding="utf-8") as f:
+                        name = f.read().strip()
+                    if self._snapshot is None or self._snapshot.name != name:
+                        self._snapshot = CorpusSnapshot(os.path.join(self.root, name))
+                        logger.info("Opened corpus snapshot %s", name)
+                    self._pointer_mtime = mtime
+                except (OSError, ValueError) as e:
+                    logger.warning("Could not open corpus snapshot: %s", e)
+        return self._snapshot
+
+    def status(self):
+        snapshot = self.current()
+        if snapshot is None:
+            return None
+        return {"name": snapshot.name, "num_jobs": len(snapshot), "created_at": snapshot.manifest["created_at"]}
+
+corpus_snapshots = SnapshotStore()
+
+if __name__ == "__main__":
+    # python -m app.services.corpus_snapshot  -- build and publish a snapshot now
+    from app.database import SessionLocal
+    from app.services.matching_engine import matching_engine
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        print(build_snapshot(session, matching_engine))
+    finally:
+        session.close()
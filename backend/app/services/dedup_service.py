@@ -0,0 +1,142 @@
+"""Near-duplicate job detection with MinHash signatures and LSH banding.
+
+Each description is reduced to word shingles and a fixed-size MinHash
+signature. Signatures are split into bands; jobs sharing any band bucket are
+candidate duplicates, and a candidate whose estimated Jaccard similarity is at
+least DUPLICATE_THRESHOLD joins its cluster. Lookups only touch one bucket per
+band, so insert-time checks stay sub-linear in catalog size.
+"""
+import hashlib
+import os
+import re
+import threading
+
+import numpy as np
+from sqlalchemy import func
+
+from app.models.models import Job
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.8"))
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+_TOKEN = re.compile(r"[a-z0-9#+]+")
+
+
+def shingles(text):
+    tokens = _TOKEN.findall((text or "").lower())
+    if len(tokens) < SHINGLE_SIZE:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(text):
+    """uint32[NUM_PERM] MinHash of the text's shingles, or None for empty text."""
+    grams = shingles(text)
+    if not grams:
+        return None
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=4).digest(), "little") for g in grams),
+        dtype=np.uint64, count=len(grams),
+    )
+    # Universal hashing (a*x + b) mod p; uint64 overflow is fine for MinHash
+    with np.errstate(over="ignore"):
+        permuted = np.bitwise_and((np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME, _MAX_HASH)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def signature_from_bytes(data):
+    return np.frombuffer(data, dtype=np.uint32) if data else None
+
+
+def estimate_jaccard(a, b):
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+class LSHIndex:
+    """Banded LSH over MinHash signatures, tracking each job's canonical posting."""
+
+    def __init__(self, threshold=DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.buckets = [{} for _ in range(BANDS)]
+        self.signatures = {}
+        self.canonical = {}
+
+    def _band_keys(self, signature):
+        return [signature[i * ROWS:(i + 1) * ROWS].tobytes() for i in range(BANDS)]
+
+    def add(self, job_id, signature, canonical_id=None):
+        self.signatures[job_id] = signature
+        self.canonical[job_id] = canonical_id or job_id
+        for band, key in zip(self.buckets, self._band_keys(signature)):
+            band.setdefault(key, []).append(job_id)
+
+    def candidates(self, signature):
+        found = set()
+        for band, key in zip(self.buckets, self._band_keys(signature)):
+            found.update(band.get(key, ()))
+        return found
+
+    def find_canonical(self, signature):
+        """Canonical job id of the closest near-duplicate, or None."""
+        best_id, best_score = None, self.threshold
+        for job_id in self.candidates(signature):
+            score = estimate_jaccard(signature, self.signatures[job_id])
+            if score >= best_score:
+                best_id, best_score = job_id, score
+        return self.canonical[best_id] if best_id is not None else None
+
+    def clear(self):
+        for band in self.buckets:
+            band.clear()
+        self.signatures.clear()
+        self.canonical.clear()
+
+
+class DedupService:
+    def __init__(self):
+        self.index = LSHIndex()
+        self._max_id = 0
+        self._lock = threading.Lock()
+
+    def refresh(self, db):
+        """Load signatures of jobs inserted since the last refresh."""
+        max_id = db.query(func.max(Job.id)).scalar() or 0
+        if max_id <= self._max_id:
+            return
+        rows = db.query(Job.id, Job.minhash, Job.duplicate_of).filter(
+            Job.id > self._max_id,
+            Job.minhash.isnot(None)
+        ).order_by(Job.id).all()
+        for job_id, data, duplicate_of in rows:
+            self.index.add(job_id, signature_from_bytes(data), duplicate_of)
+        self._max_id = max_id
+
+    def add_job(self, db, job):
+        """Sign ``job``, link it to an existing near-duplicate and commit it."""
+        with self._lock:
+            self.refresh(db)
+            signature = minhash_signature(job.description)
+            if signature is not None:
+                job.minhash = signature.tobytes()
+                job.duplicate_of = self.index.find_canonical(signature)
+            db.add(job)
+            db.commit()
+            if signature is not None:
+                self.index.add(job.id, signature, job.duplicate_of)
+            self._max_id = max(self._max_id, job.id)
+        return job
+
+    def stats(self):
+        canonical = set(self.index.canonical.values())
+        return {"indexed": len(self.index.signatures), "clusters": len(canonical),
+                "duplicates": len(self.index.signatures) - len(canonical)}
+
+dedup_service = DedupService()
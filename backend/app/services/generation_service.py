@@ -0,0 +1,176 @@
+"""Batched, cached cover letter and resume tailoring generation.
+
+A resume is analysed once per batch, job skills are cached per job content,
+and generated output is cached by (backend, resume hash, job content hash) so
+repeated requests for the same pair are served from memory. Generators plug in
+through ``GenerationBackend``; the default wraps the existing templates.
+"""
+import hashlib
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List
+
+from app.services.cover_letter import cover_letter_generator
+from app.services.matching_engine import matching_engine
+from app.services.tailor_service import tailor_service
+
+GENERATION_CACHE_SIZE = int(os.getenv("GENERATION_CACHE_SIZE", "2048"))
+GENERATION_CACHE_TTL = int(os.getenv("GENERATION_CACHE_TTL", str(24 * 60 * 60)))
+# Each process prunes its own cache, at most this often, on writes
+GENERATION_CACHE_PRUNE_SECONDS = int(os.getenv("GENERATION_CACHE_PRUNE_SECONDS", "900"))
+
+
+def content_hash(text) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+class GenerationBackend(ABC):
+    """Produces cover letters and tailoring suggestions for one job.
+
+    ``name`` is part of every cache key, so switching backends never serves
+    another backend's output.
+    """
+    name = "base"
+
+    @abstractmethod
+    def cover_letter(self, job_title, company, job_description, candidate_name, candidate_skills):
+        """Return the cover letter text."""
+
+    @abstractmethod
+    def tailor_suggestions(self, resume_text, job_title, missing_skills):
+        """Return a list of tailoring suggestions."""
+
+
+class TemplateBackend(GenerationBackend):
+    name = "template"
+
+    def cover_letter(self, job_title, company, job_description, candidate_name, candidate_skills):
+        return cover_letter_generator.generate(job_title, company, job_description, candidate_name, candidate_skills)
+
+    def tailor_suggestions(self, resume_text, job_title, missing_skills):
+        return tailor_service.generate_suggestions(resume_text, job_title, missing_skills)
+
+
+class GenerationCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl`` seconds.
+
+    Expired entries are dropped by ``set`` every ``prune_seconds``, so each
+    worker keeps its own cache bounded without a scheduler.
+    """
+
+    def __init__(self, max_entries=GENERATION_CACHE_SIZE, ttl=GENERATION_CACHE_TTL,
+                 prune_seconds=GENERATION_CACHE_PRUNE_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.prune_seconds = prune_seconds
+        self._last_prune = time.monotonic()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_prune > self.prune_seconds:
+                self._prune_locked(now)
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def prune(self) -> int:
+        """Drop expired entries, returning how many were removed."""
+        with self._lock:
+            return self._prune_locked(time.monotonic())
+
+    def _prune_locked(self, now) -> int:
+        expired = [key for key, (created, _) in self._entries.items() if now - created > self.ttl]
+        for key in expired:
+            del self._entries[key]
+        self._last_prune = now
+        return len(expired)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+@dataclass
+class ResumeAnalysis:
+    resume_text: str
+    resume_hash: str
+    skills: List[str]
+
+
+class GenerationService:
+    def __init__(self, engine=None, backend=None, cache=None):
+        self.engine = engine or matching_engine
+        self.backend = backend or TemplateBackend()
+        self.cache = cache or GenerationCache()
+
+    def analyze_resume(self, resume_text) -> ResumeAnalysis:
+        resume_hash = content_hash(resume_text)
+        skills = self.cache.get_or_compute(
+            ("skills", resume_hash), lambda: self.engine.extract_skills(resume_text)
+        )
+        return ResumeAnalysis(resume_text, resume_hash, skills)
+
+    def job_skills(self, text):
+        return self.cache.get_or_compute(("skills", content_hash(text)), lambda: self.engine.extract_skills(text))
+
+    def cover_letters(self, jobs, resume_text, candidate_name):
+        """Generate a cover letter per job, analysing the resume only once."""
+        resume = self.analyze_resume(resume_text)
+        results = []
+        for job in jobs:
+            key = (self.backend.name, "cover_letter", resume.resume_hash,
+                   content_hash(f"{job.title}\n{job.company}\n{job.description}"), candidate_name)
+            letter = self.cache.get_or_compute(key, lambda: self.backend.cover_letter(
+                job.title, job.company, job.description, candidate_name, resume.skills
+            ))
+            results.append({"job_id": job.id, "cover_letter": letter})
+        return results
+
+    def tailor(self, jobs, resume_text):
+        """Generate tailoring suggestions per job, analysing the resume only once."""
+        resume = self.analyze_resume(resume_text)
+        resume_skills = set(resume.skills)
+        results = []
+        for job in jobs:
+            key = (self.backend.name, "tailor", resume.resume_hash, content_hash(f"{job.title}\n{job.description}"))
+
+            def compute():
+                missing_skills = list(set(self.job_skills(job.description)) - resume_skills)
+                return self.backend.tailor_suggestions(resume.resume_text, job.title, missing_skills)
+
+            results.append({
+                "job_id": job.id,
+                "job_title": job.title,
+                "company": job.company,
+                "suggestions": self.cache.get_or_compute(key, compute)
+            })
+        return results
+
+generation_service = GenerationService()
@@ -1,35 +1,107 @@
+import threading
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import or_, and_, func
 from app.models.models import Job
+from app.services.location_service import normalize_location, prefix_bounds, parse_location, GeoGridIndex
+from app.services.dedup_service import dedup_service
 
 class JobService:
-    async def get_jobs(self, 
-                       db: Session,
-                       location: Optional[str] = None, 
-                       remote_status: Optional[str] = None, 
-                       experience_level: Optional[str] = None,
-                       keywords: Optional[str] = None) -> List[Job]:
-        """Fetch jobs from database with filters."""
-        query = db.query(Job)
-        
-        if location:
-            # If user searches 'Remote', check both location and remote_status
-            if location.lower() == 'remote':
-                query = query.filter(or_(
-                    Job.location.ilike(f"%{location}%"),
-                    Job.remote_status == 'Remote'
-                ))
-            else:
-                query = query.filter(Job.location.ilike(f"%{location}%"))
+    def __init__(self):
+        self.geo_index = GeoGridIndex()
+        self._geo_max_id = 0
+        self._geo_lock = threading.Lock()
+
+    def refresh_geo_index(self, db: Session):
+        """Add jobs inserted since the last refresh to the in-memory geo index.
+
+        Only new ids are loaded, so other workers' inserts are picked up cheaply.
+        Jobs whose location is edited after ingestion keep their old position
+        until reset_geo_index is called.
+        """
+        with self._geo_lock:
+            max_id = db.query(func.max(Job.id)).scalar() or 0
+            if max_id <= self._geo_max_id:
+                return
+            rows = db.query(Job.id, Job.latitude, Job.longitude).filter(
+                Job.id > self._geo_max_id,
+                Job.latitude.isnot(None)
+            ).all()
+            for job_id, latitude, longitude in rows:
+                self.geo_index.add(job_id, latitude, longitude)
+            self._geo_max_id = max_id
+
+    def reset_geo_index(self):
+        with self._geo_lock:
+            self.geo_index.clear()
+            self._geo_max_id = 0
+
+    def _location_filter(self, db: Session, location: str, radius_km: Optional[float]):
+        parsed = parse_location(location)
+        normalized = normalize_location(location)
+        lower, upper = prefix_bounds(normalized)
+        prefix_filter = and_(Job.location_normalized >= lower, Job.location_normalized < upper)
+
+        # If user searches 'Remote', check both location and remote_status
+        if parsed.is_remote and not parsed.city:
+            return or_(prefix_filter, Job.remote_status == 'Remote')
+
+        if radius_km is not None and parsed.latitude is not None:
+            self.refresh_geo_index(db)
+            job_ids = self.geo_index.within(parsed.latitude, parsed.longitude, radius_km)
+            return Job.id.in_(job_ids)
+
+        if parsed.city:
+            conditions = [Job.city == parsed.city]
+            if parsed.region:
+                conditions.append(Job.region == parsed.region)
+            return and_(*conditions)
+        if parsed.region:
+            return Job.region == parsed.region
+        if parsed.country:
+            return Job.country == parsed.country
+        return prefix_filter
+
+    def filters_key(self,
+                    location: Optional[str] = None,
+                    remote_status: Optional[str] = None,
+                    experience_level: Optional[str] = None,
+                    keywords: Optional[str] = None,
+                    radius_km: Optional[float] = None,
+                    include_duplicates: bool = False) -> tuple:
+        """Normalized key identifying a get_jobs result, for request coalescing."""
+        keyword_key = tuple(sorted({k.strip().lower() for k in keywords.split(",")})) if keywords else None
+        return (normalize_location(location), remote_status or None, experience_level or None, keyword_key,
+                radius_km, include_duplicates)
+
+    def build_jobs_query(self,
+                         db: Session,
+                         location: Optional[str] = None,
+                         remote_status: Optional[str] = None,
+                         experience_level: Optional[str] = None,
+                         keywords: Optional[str] = None,
+                         radius_km: Optional[float] = None,
+                         include_duplicates: bool = False) -> Query:
+        """Build the filtered, ordered jobs query without executing it.
+
+        Unless ``include_duplicates`` is set, each near-duplicate cluster that
+        matches the filters is collapsed to one posting: the canonical one when
+        it matches too, otherwise its earliest matching repost.
+        """
+        conditions = []
+
+        if normalize_location(location):
+            conditions.append(self._location_filter(db, location, radius_km))
         
         if remote_status:
-            query = query.filter(Job.remote_status == remote_status)
+            conditions.append(Job.remote_status == remote_status)
             
         if experience_level:
-            query = query.filter(Job.experience_level == experience_level)
+            conditions.append(Job.experience_level == experience_level)
             
         if keywords:
+            # Free-text keywords can't use an index; they are applied while
+            # walking ix_jobs_posted_at (or the narrower filter index above)
             keyword_list = [k.strip().lower() for k in keywords.split(",")]
             filters = []
             for kw in keyword_list:
@@ -37,11 +109,55 @@ class JobService:
                 filters.append(Job.title.ilike(kw_filter))
                 filters.append(Job.description.ilike(kw_filter))
                 filters.append(Job.skills_required.ilike(kw_filter))
-            query = query.filter(or_(*filters))
+            conditions.append(or_(*filters))
+
+        query = db.query(Job)
+        if include_duplicates:
+            query = query.filter(*conditions)
+        elif not conditions:
+            # Every canonical posting matches, so each cluster collapses to it
+            query = query.filter(Job.duplicate_of.is_(None))
+        else:
+            # Reposts always get higher ids than their canonical posting, so the
+            # lowest matching id per cluster prefers the canonical one
+            representatives = db.query(func.min(Job.id)).filter(*conditions).group_by(
+                func.coalesce(Job.duplicate_of, Job.id))
+            query = query.filter(Job.id.in_(representatives.scalar_subquery()))
             
-        return query.order_by(Job.posted_at.desc()).all()
+        return query.order_by(Job.posted_at.desc())
+
+    async def get_jobs(self, 
+                       db: Session,
+                       location: Optional[str] = None, 
+                       remote_status: Optional[str] = None, 
+                       experience_level: Optional[str] = None,
+                       keywords: Optional[str] = None,
+                       radius_km: Optional[float] = None,
+                       include_duplicates: bool = False) -> List[Job]:
+        """Fetch jobs from database with filters.
+
+        With ``radius_km`` and a location the gazetteer can place, returns jobs
+        within that many kilometres; otherwise the location matches on city,
+        region or country.
+        """
+        return self.build_jobs_query(
+            db, location, remote_status, experience_level, keywords, radius_km, include_duplicates
+        ).all()
+
+    def build_job_by_id_query(self, db: Session, job_id: int) -> Query:
+        return db.query(Job).filter(Job.id == job_id)
 
     async def get_job_by_id(self, db: Session, job_id: int) -> Optional[Job]:
-        return db.query(Job).filter(Job.id == job_id).first()
+        return self.build_job_by_id_query(db, job_id).first()
+
+    async def get_jobs_by_ids(self, db: Session, job_ids: List[int]) -> dict:
+        """Fetch several jobs in one query, keyed by id."""
+        if not job_ids:
+            return {}
+        return {job.id: job for job in db.query(Job).filter(Job.id.in_(set(job_ids))).all()}
+
+    def add_job(self, db: Session, **fields) -> Job:
+        """Insert a job, flagging it as a near-duplicate of an existing posting if it is one."""
+        return dedup_service.add_job(db, Job(**fields))
 
 job_service = JobService()
@@ -0,0 +1,252 @@
+import math
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+_WHITESPACE = re.compile(r"\s+")
+_REMOTE_WORD = re.compile(r"\bremote\b")
+
+US_STATES = {
+    "al": "alabama", "ak": "alaska", "az": "arizona", "ar": "arkansas", "ca": "california",
+    "co": "colorado", "ct": "connecticut", "de": "delaware", "dc": "district of columbia",
+    "fl": "florida", "ga": "georgia", "hi": "hawaii", "id": "idaho", "il": "illinois",
+    "in": "indiana", "ia": "iowa", "ks": "kansas", "ky": "kentucky", "la": "louisiana",
+    "me": "maine", "md": "maryland", "ma": "massachusetts", "mi": "michigan", "mn": "minnesota",
+    "ms": "mississippi", "mo": "missouri", "mt": "montana", "ne": "nebraska", "nv": "nevada",
+    "nh": "new hampshire", "nj": "new jersey", "nm": "new mexico", "ny": "new york",
+    "nc": "north carolina", "nd": "north dakota", "oh": "ohio", "ok": "oklahoma", "or": "oregon",
+    "pa": "pennsylvania", "ri": "rhode island", "sc": "south carolina", "sd": "south dakota",
+    "tn": "tennessee", "tx": "texas", "ut": "utah", "vt": "vermont", "va": "virginia",
+    "wa": "washington", "wv": "west virginia", "wi": "wisconsin", "wy": "wyoming",
+}
+US_STATE_NAMES = {name: code for code, name in US_STATES.items()}
+
+# Common spellings -> ISO 3166 alpha-2 code (lowercase)
+COUNTRY_ALIASES = {
+    "us": "us", "usa": "us", "united states": "us", "united states of america": "us",
+    "uk": "gb", "gb": "gb", "united kingdom": "gb", "england": "gb", "scotland": "gb",
+    "ca": "ca", "canada": "ca", "de": "de", "germany": "de", "fr": "fr", "france": "fr",
+    "nl": "nl", "netherlands": "nl", "ie": "ie", "ireland": "ie", "es": "es", "spain": "es",
+    "pt": "pt", "portugal": "pt", "in": "in", "india": "in", "sg": "sg", "singapore": "sg",
+    "au": "au", "australia": "au", "ke": "ke", "kenya": "ke", "ng": "ng", "nigeria": "ng",
+    "za": "za", "south africa": "za", "ae": "ae", "uae": "ae", "united arab emirates": "ae",
+}
+
+# Small built-in gazetteer: (city, region, country) -> (latitude, longitude).
+# US cities carry their state, since names like Portland or Newark repeat across states.
+CITY_COORDINATES = {
+    ("new york", "ny", "us"): (40.7128, -74.0060),
+    ("brooklyn", "ny", "us"): (40.6782, -73.9442),
+    ("jersey city", "nj", "us"): (40.7178, -74.0431),
+    ("newark", "nj", "us"): (40.7357, -74.1724),
+    ("newark", "de", "us"): (39.6837, -75.7497),
+    ("boston", "ma", "us"): (42.3601, -71.0589),
+    ("philadelphia", "pa", "us"): (39.9526, -75.1652),
+    ("washington", "dc", "us"): (38.9072, -77.0369),
+    ("atlanta", "ga", "us"): (33.7490, -84.3880),
+    ("miami", "fl", "us"): (25.7617, -80.1918),
+    ("chicago", "il", "us"): (41.8781, -87.6298),
+    ("austin", "tx", "us"): (30.2672, -97.7431),
+    ("dallas", "tx", "us"): (32.7767, -96.7970),
+    ("houston", "tx", "us"): (29.7604, -95.3698),
+    ("denver", "co", "us"): (39.7392, -104.9903),
+    ("seattle", "wa", "us"): (47.6062, -122.3321),
+    ("portland", "or", "us"): (45.5152, -122.6784),
+    ("portland", "me", "us"): (43.6591, -70.2568),
+    ("san francisco", "ca", "us"): (37.7749, -122.4194),
+    ("oakland", "ca", "us"): (37.8044, -122.2712),
+    ("san jose", "ca", "us"): (37.3382, -121.8863),
+    ("palo alto", "ca", "us"): (37.4419, -122.1430),
+    ("mountain view", "ca", "us"): (37.3861, -122.0839),
+    ("los angeles", "ca", "us"): (34.0522, -118.2437),
+    ("san diego", "ca", "us"): (32.7157, -117.1611),
+    ("toronto", None, "ca"): (43.6532, -79.3832),
+    ("vancouver", None, "ca"): (49.2827, -123.1207),
+    ("london", None, "gb"): (51.5074, -0.1278),
+    ("dublin", None, "ie"): (53.3498, -6.2603),
+    ("berlin", None, "de"): (52.5200, 13.4050),
+    ("paris", None, "fr"): (48.8566, 2.3522),
+    ("amsterdam", None, "nl"): (52.3676, 4.9041),
+    ("madrid", None, "es"): (40.4168, -3.7038),
+    ("lisbon", None, "pt"): (38.7223, -9.1393),
+    ("bangalore", None, "in"): (12.9716, 77.5946),
+    ("singapore", None, "sg"): (1.3521, 103.8198),
+    ("sydney", None, "au"): (-33.8688, 151.2093),
+    ("dubai", None, "ae"): (25.2048, 55.2708),
+    ("nairobi", None, "ke"): (-1.2921, 36.8219),
+    ("mombasa", None, "ke"): (-4.0435, 39.6682),
+    ("lagos", None, "ng"): (6.5244, 3.3792),
+    ("cape town", None, "za"): (-33.9249, 18.4241),
+}
+CITY_COUNTRIES = {}
+# Where a location names no region, the first entry listed for the city wins
+CITY_DEFAULT_COORDINATES = {}
+for (_city, _region, _country), _coordinates in CITY_COORDINATES.items():
+    CITY_COUNTRIES.setdefault(_city, _country)
+    CITY_DEFAULT_COORDINATES.setdefault((_city, _country), _coordinates)
+
+EARTH_RADIUS_KM = 6371.0
+
+
+@dataclass
+class ParsedLocation:
+    city: Optional[str] = None
+    region: Optional[str] = None
+    country: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    is_remote: bool = False
+
+
+def normalize_location(location):
+    """Lowercase and collapse whitespace so locations can be compared and indexed."""
+    if not location:
+        return None
+    return _WHITESPACE.sub(" ", location.strip().lower()) or None
+
+
+def prefix_bounds(prefix):
+    """Return (lower, upper) bounds matching every string that starts with ``prefix``.
+
+    Used instead of ``LIKE 'prefix%'`` so the lookup is a plain range scan on a
+    b-tree index in both SQLite and PostgreSQL.
+    """
+    return prefix, prefix + "\uffff"
+
+
+def _strip_remote(part):
+    """Remove the word "remote" from a location part, returning what is left."""
+    return _REMOTE_WORD.sub(" ", part).strip(" ()-/") or None
+
+
+def _resolve_tail(tail, city):
+    """Classify a trailing part as ("region", code) or ("country", code).
+
+    Two-letter codes like "CA" or "DE" are both US states and countries, so
+    the city is used to break the tie when the gazetteer knows it.
+    """
+    is_state = tail in US_STATES or tail in US_STATE_NAMES
+    is_country = tail in COUNTRY_ALIASES
+    if is_state and is_country:
+        is_state = CITY_COUNTRIES.get(city, "us") != COUNTRY_ALIASES[tail] or tail in US_STATE_NAMES
+    if is_state:
+        return "region", tail if tail in US_STATES else US_STATE_NAMES[tail]
+    if is_country:
+        return "country", COUNTRY_ALIASES[tail]
+    return None, None
+
+
+def _city_coordinates(city, region, country):
+    """Gazetteer coordinates for a city, or None.
+
+    A US city given with a state only matches the entry for that state, so
+    "Portland, ME" never gets Portland, OR's coordinates.
+    """
+    if region is not None and country == "us":
+        return CITY_COORDINATES.get((city, region, country))
+    return CITY_DEFAULT_COORDINATES.get((city, country))
+
+
+def parse_location(location) -> ParsedLocation:
+    """Parse free text like "New York, NY" or "London, UK" into structured fields.
+
+    Values are stored lowercase; coordinates come from CITY_COORDINATES and are
+    left empty for cities the gazetteer doesn't know.
+    """
+    parsed = ParsedLocation()
+    normalized = normalize_location(location)
+    if not normalized:
+        return parsed
+
+    parts = []
+    for part in normalized.replace(" - ", ",").split(","):
+        part = part.strip(" .")
+        if _REMOTE_WORD.search(part):
+            parsed.is_remote = True
+            part = _strip_remote(part)
+        if part:
+            parts.append(part)
+
+    # Peel region/country off the end, the leading part is the city
+    while len(parts) > 1:
+        kind, code = _resolve_tail(parts[-1], parts[0])
+        if kind == "country" and parsed.country is None and parsed.region is None:
+            parsed.country = code
+        elif kind == "region" and parsed.region is None:
+            parsed.region = code
+            parsed.country = parsed.country or "us"
+        else:
+            break
+        parts.pop()
+
+    if len(parts) == 1 and parsed.region is None and parsed.country is None and parts[0] not in CITY_COUNTRIES:
+        # A bare region or country, e.g. "TX", "Texas" or "Kenya"
+        kind, code = _resolve_tail(parts[0], None)
+        if kind == "region":
+            parsed.region, parsed.country = code, "us"
+            return parsed
+        if kind == "country":
+            parsed.country = code
+            return parsed
+
+    if parts:
+        parsed.city = parts[0]
+        if len(parts) > 1 and parsed.region is None:
+            parsed.region = ", ".join(parts[1:])
+        parsed.country = parsed.country or CITY_COUNTRIES.get(parsed.city)
+        coordinates = _city_coordinates(parsed.city, parsed.region, parsed.country)
+        if coordinates:
+            parsed.latitude, parsed.longitude = coordinates
+    return parsed
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class GeoGridIndex:
+    """In-memory grid of points bucketed into cells of ``cell_degrees`` square.
+
+    A radius query only visits the cells overlapping the query's bounding box
+    and then checks the exact great-circle distance for points inside them.
+    """
+
+    def __init__(self, cell_degrees=0.5):
+        self.cell_degrees = cell_degrees
+        self.cells = {}
+        self.size = 0
+
+    def _cell(self, latitude, longitude):
+        return (math.floor(latitude / self.cell_degrees), math.floor(longitude / self.cell_degrees))
+
+    def add(self, item_id, latitude, longitude):
+        self.cells.setdefault(self._cell(latitude, longitude), []).append((item_id, latitude, longitude))
+        self.size += 1
+
+    def clear(self):
+        self.cells.clear()
+        self.size = 0
+
+    def within(self, latitude, longitude, radius_km):
+        """Return ids within ``radius_km`` of the point, nearest first."""
+        lat_delta = radius_km / 111.0
+        cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+        lon_delta = min(radius_km / (111.0 * cos_lat), 180.0)
+
+        min_row, min_col = self._cell(max(latitude - lat_delta, -90.0), longitude - lon_delta)
+        max_row, max_col = self._cell(min(latitude + lat_delta, 90.0), longitude + lon_delta)
+        cols_per_world = round(360 / self.cell_degrees)
+
+        hits = []
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, min(max_col, min_col + cols_per_world - 1) + 1):
+                # Wrap across the antimeridian
+                wrapped = (col + cols_per_world // 2) % cols_per_world - cols_per_world // 2
+                for item_id, lat, lon in self.cells.get((row, wrapped), ()):
+                    distance = haversine_km(latitude, longitude, lat, lon)
+                    if distance <= radius_km:
+                        hits.append((distance, item_id))
+        hits.sort()
+        return [item_id for _, item_id in hits]
@@ -1,6 +1,7 @@
+import os
 import re
 import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
@@ -22,9 +23,57 @@ TECH_SKILLS_DB = {
     "git", "linux", "bash", "agile", "scrum", "jira"
 }
 
+# Bump whenever calculate_match_score changes so stored scores can be backfilled
+SCORING_VERSION = "hybrid-v1"
+
+# Hash buckets for corpus TF-IDF vectors; collisions are negligible at this size
+CORPUS_HASH_FEATURES = 2 ** 20
+
+# Stage-two candidate set size for cascade ranking
+CASCADE_CANDIDATES = int(os.getenv("CASCADE_CANDIDATES", "50"))
+
+# We also handle some common aliases
+SKILL_ALIASES = {
+    "postgres": "postgresql",
+    "postgremsql": "postgresql",
+    "sql server": "mssql",
+    "mongodb": "mongo",
+    "react.js": "react",
+    "node": "node.js",
+    "js": "javascript",
+    "ts": "typescript",
+    "full stack": "fullstack",
+    "frontend": "front-end",
+    "backend": "back-end"
+}
+
+# Add a few more common ones to DB if they were missing
+EXTRA_SKILLS = {"java", "spring boot", "django", "express", "tailwind css", "bootstrap", "flutter", "react native", "aws s3", "aws lambda", "azure", "google cloud"}
+
+# Every skill dictionary_skills can return, in a stable order (used for skill bitsets)
+SKILL_VOCABULARY = sorted(TECH_SKILLS_DB.union(EXTRA_SKILLS).union(SKILL_ALIASES.values()))
+
+# Patterns are compiled once instead of on every extract_skills call
+_SKILL_PATTERNS = [(skill, re.compile(r'\b' + re.escape(skill) + r'\b')) for skill in TECH_SKILLS_DB.union(EXTRA_SKILLS)]
+_ALIAS_PATTERNS = [(target, re.compile(r'\b' + re.escape(alias) + r'\b')) for alias, target in SKILL_ALIASES.items()]
+
+def corpus_hasher():
+    """Stateless term counter for corpus vectors: hashes terms instead of keeping a vocabulary."""
+    return HashingVectorizer(stop_words='english', n_features=CORPUS_HASH_FEATURES,
+                             alternate_sign=False, norm=None)
+
 class MatchingEngine:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(stop_words='english')
+    def fit_corpus(self, documents):
+        """TF-IDF over hashed terms for the job corpus; returns (idf, document matrix).
+
+        Query text is vectorized with corpus_hasher and the idf alone, so
+        readers never need the corpus vocabulary.
+        """
+        counts = corpus_hasher().transform([self.preprocess_text(doc) for doc in documents])
+        transformer = TfidfTransformer().fit(counts)
+        # Buckets no job uses get idf 0, so unseen query terms drop out as with a vocabulary
+        idf = transformer.idf_ * (counts.getnnz(axis=0) > 0)
+        return idf, transformer.transform(counts)
 
     def normalize_spaced_text(self, text):
         """Detect and fix text that has been extracted with spaces between every letter, line by line."""
@@ -72,19 +121,26 @@ class MatchingEngine:
 
     def calculate_match_score(self, resume_text, job_description):
         """Calculate similarity score using a hybrid of TF-IDF and Skill Match."""
-        processed_resume = self.preprocess_text(resume_text)
-        processed_job = self.preprocess_text(job_description)
+        return self._hybrid_score(
+            self.preprocess_text(resume_text), set(self.extract_skills(resume_text)), job_description
+        )
+
+    def _hybrid_score(self, processed_resume, resume_skills, job_description, processed_job=None, job_skills=None):
+        """calculate_match_score with the resume side (and optionally the job side) already processed."""
+        if processed_job is None:
+            processed_job = self.preprocess_text(job_description)
         
         # 1. Content Similarity (TF-IDF)
         try:
-            tfidf_matrix = self.vectorizer.fit_transform([processed_resume, processed_job])
+            # A fresh vectorizer per pair keeps scoring safe to run from worker threads
+            tfidf_matrix = TfidfVectorizer(stop_words='english').fit_transform([processed_resume, processed_job])
             content_similarity = float(cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0])
         except:
             content_similarity = 0.0
             
         # 2. Skill Match
-        resume_skills = set(self.extract_skills(resume_text))
-        job_skills = set(self.extract_skills(job_description))
+        if job_skills is None:
+            job_skills = set(self.extract_skills(job_description))
         
         if not job_skills:
             skill_score = content_similarity
@@ -103,6 +159,20 @@ class MatchingEngine:
             
         return round(final_score * 100, 2)
 
+    def rank_jobs(self, resume_text, job_contents, top_k=10):
+        """Return the ``top_k`` (job_id, score) pairs for a resume, best first.
+
+        Every job in ``job_contents`` (job id -> text as passed to
+        calculate_match_score) gets the full hybrid score; the resume is
+        preprocessed once. Candidate selection lives in RecommendationService.
+        """
+        processed_resume = self.preprocess_text(resume_text)
+        resume_skills = set(self.extract_skills(resume_text))
+        scores = [(self._hybrid_score(processed_resume, resume_skills, content), job_id)
+                  for job_id, content in job_contents.items()]
+        scores.sort(key=lambda pair: (-pair[0], pair[1]))
+        return [(job_id, score) for score, job_id in scores[:top_k]]
+
     def extract_skills(self, text):
         """Extract keywords from text using dictionary-based matching and NLP."""
         if not text:
@@ -111,35 +181,9 @@ class MatchingEngine:
         # Normalize and clean text for extraction
         text = self.normalize_spaced_text(text)
         text_lower = text.lower()
-        found_skills = set()
         
         # 1. Dictionary-based matching (High precision for tech stack)
-        # We also handle some common aliases
-        aliases = {
-            "postgres": "postgresql",
-            "postgremsql": "postgresql",
-            "sql server": "mssql",
-            "mongodb": "mongo",
-            "react.js": "react",
-            "node": "node.js",
-            "js": "javascript",
-            "ts": "typescript",
-            "full stack": "fullstack",
-            "frontend": "front-end",
-            "backend": "back-end"
-        }
-        
-        # Add a few more common ones to DB if they were missing
-        extra_skills = {"java", "spring boot", "django", "express", "tailwind css", "bootstrap", "flutter", "react native", "aws s3", "aws lambda", "azure", "google cloud"}
-        local_db = TECH_SKILLS_DB.union(extra_skills)
-        
-        for skill in local_db:
-            if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
-                found_skills.add(skill)
-        
-        for alias, target in aliases.items():
-            if re.search(r'\b' + re.escape(alias) + r'\b', text_lower):
-                found_skills.add(target)
+        found_skills = self._match_dictionary(text_lower)
         
         # 2. NLP-based extraction (For catching nouns/proper nouns not in DB)
         # Avoid generic terms that dilute the score
@@ -162,6 +206,17 @@ class MatchingEngine:
         
         return list(found_skills)
 
+    def dictionary_skills(self, text):
+        """Dictionary and alias matches only: cheap, deterministic and spaCy-free."""
+        if not text:
+            return set()
+        return self._match_dictionary(self.normalize_spaced_text(text).lower())
+
+    def _match_dictionary(self, text_lower):
+        found_skills = {skill for skill, pattern in _SKILL_PATTERNS if pattern.search(text_lower)}
+        found_skills.update(target for target, pattern in _ALIAS_PATTERNS if pattern.search(text_lower))
+        return found_skills
+
     def compare_skills(self, resume_skills, job_skills):
         """Identify missing skills and provide advice."""
         resume_set = set([s.lower() for s in resume_skills])
@@ -189,3 +244,5 @@ class MatchingEngine:
             "missing": list(sorted_missing),
             "tailoring_advice": advice
         }
+
+matching_engine = MatchingEngine()
@@ -0,0 +1,151 @@
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models.models import Job
+from app.services.corpus_snapshot import corpus_snapshots
+from app.services.matching_engine import matching_engine, CASCADE_CANDIDATES
+
+class RecommendationService:
+    def __init__(self, engine=None, snapshots=None):
+        self.engine = engine or matching_engine
+        self.snapshots = snapshots or corpus_snapshots
+        # Skills of jobs added after the current snapshot, extracted once per process
+        self._delta_lock = threading.Lock()
+        self._delta_snapshot = None
+        self._delta_max_id = 0
+        self._delta = {}
+
+    def delta_skills(self, db: Session, snapshot) -> dict:
+        """Dictionary skills of jobs newer than ``snapshot``, extracted incrementally."""
+        with self._delta_lock:
+            if self._delta_snapshot != snapshot.name:
+                self._delta_snapshot = snapshot.name
+                self._delta_max_id = int(snapshot.job_ids[-1]) if len(snapshot) else 0
+                self._delta = {}
+            rows = db.query(Job.id, Job.skills_required, Job.description).filter(
+                Job.id > self._delta_max_id).order_by(Job.id).all()
+            for job_id, skills, description in rows:
+                self._delta[job_id] = self.engine.dictionary_skills(f"{skills} {description}")
+                self._delta_max_id = job_id
+            return dict(self._delta)
+
+    def skill_candidates(self, db: Session, snapshot, resume_text: str, candidate_k: int):
+        """Stage one: the ``candidate_k`` best job ids by dictionary-skill overlap.
+
+        Scores the whole snapshot at once from its memory-mapped skill bitsets:
+        the share of each job's skills the resume covers, ties broken by the
+        number shared. Jobs with no
+        dictionary skills at all fall back to content similarity in the hybrid
+        score, so they are ranked by cosine similarity against the snapshot's
+        TF-IDF matrix instead of being dropped. Other jobs sharing no skills
+        are dropped.
+        """
+        resume_skills = self.engine.dictionary_skills(resume_text)
+        job_ids = np.asarray(snapshot.job_ids, dtype=np.int64)
+        shared = snapshot.skill_overlap_counts(resume_skills).astype(np.int64)
+        totals = np.asarray(snapshot.skill_counts, dtype=np.int64)
+        scores = np.divide(shared, totals, out=np.zeros(len(job_ids)), where=totals > 0)
+
+        skill_less = totals == 0
+        if skill_less.any():
+            similarities = snapshot.content_similarities(self.engine.preprocess_text(resume_text))
+            scores[skill_less] = similarities[skill_less]
+
+        delta = self.delta_skills(db, snapshot)
+        if delta:
+            # Newer jobs aren't in the TF-IDF matrix yet, so they rank on skills only
+            delta_shared = np.array([len(resume_skills & skills) for skills in delta.values()], dtype=np.int64)
+            delta_totals = np.array([len(skills) for skills in delta.values()], dtype=np.int64)
+            job_ids = np.concatenate([job_ids, np.fromiter(delta, dtype=np.int64, count=len(delta))])
+            shared = np.concatenate([shared, delta_shared])
+            scores = np.concatenate([scores, np.divide(delta_shared, delta_totals, out=np.zeros(len(delta)),
+                                                       where=delta_totals > 0)])
+
+        hits = np.flatnonzero(scores > 0)
+        job_ids, shared, scores = job_ids[hits], shared[hits], scores[hits]
+        # lexsort's last key is the primary one; reverse for descending
+        order = np.lexsort((job_ids, shared, scores))[::-1][:candidate_k]
+        return job_ids[order].tolist()
+
+    def job_contents(self, db: Session, job_ids) -> dict:
+        rows = db.query(Job.id, Job.skills_required, Job.description).filter(Job.id.in_(list(job_ids))).all()
+        return {job_id: f"{skills} {description}" for job_id, skills, description in rows}
+
+    @staticmethod
+    def collapse_duplicates(ranked, jobs: dict):
+        """Keep one (job_id, score) per near-duplicate cluster, best first.
+
+        A repost can outscore its canonical posting, so clusters are collapsed
+        after ranking: the canonical posting represents its cluster when it
+        was ranked too, otherwise the best-scoring repost does.
+        """
+        representatives = {}
+        for job_id, score in ranked:
+            cluster = jobs[job_id].duplicate_of or job_id
+            if cluster not in representatives or job_id == cluster:
+                representatives[cluster] = (job_id, score)
+        return sorted(representatives.values(), key=lambda pair: (-pair[1], pair[0]))
+
+    def recommend(self, db: Session, resume_text: str, top_k: int = 10,
+                  candidate_k: Optional[int] = None, exhaustive: bool = False):
+        """Return the best (job, score) pairs for a resume using cascade ranking.
+
+        Stage one ranks the whole catalog by skill overlap on the corpus
+        snapshot; only the top ``candidate_k`` descriptions are loaded and
+        given the full hybrid score. Near-duplicate reposts are ranked like any
+        other job and collapsed to one per cluster afterwards.
+
+        Returns None when no snapshot has been published yet: building one
+        runs spaCy over the whole catalog, which is the scheduler's job (or
+        ``python -m app.services.corpus_snapshot``), never a request's.
+        ``exhaustive=True`` scores every job and needs no snapshot.
+        """
+        candidate_k = max(candidate_k or CASCADE_CANDIDATES, top_k)
+        if exhaustive:
+            job_contents = self.job_contents(db, [job_id for (job_id,) in db.query(Job.id).all()])
+        else:
+            snapshot = self.snapshots.current()
+            if snapshot is None:
+                return None
+            job_contents = self.job_contents(db, self.skill_candidates(db, snapshot, resume_text, candidate_k))
+
+        # Stage two: full hybrid scoring on the candidate set only
+        ranked = self.engine.rank_jobs(resume_text, job_contents, len(job_contents))
+        jobs = {job.id: job for job in db.query(Job).filter(Job.id.in_(list(job_contents))).all()}
+        ranked = self.collapse_duplicates([pair for pair in ranked if pair[0] in jobs], jobs)[:top_k]
+        return [(jobs[job_id], score) for job_id, score in ranked]
+
+    def cascade_recall(self, db: Session, resume_text: str, top_k: int = 10, candidate_k: Optional[int] = None):
+        """Compare recommend's cascade top-k against exhaustive top-k for one resume.
+
+        Needs a published snapshot, like recommend.
+        """
+        start = time.perf_counter()
+        exhaustive = self.recommend(db, resume_text, top_k, exhaustive=True)
+        exhaustive_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        cascade = self.recommend(db, resume_text, top_k, candidate_k)
+        cascade_ms = (time.perf_counter() - start) * 1000
+        if cascade is None:
+            raise RuntimeError("No corpus snapshot published")
+
+        exhaustive = [(job.id, score) for job, score in exhaustive]
+        cascade = [(job.id, score) for job, score in cascade]
+        # Only count jobs with a non-zero score as relevant
+        relevant = {job_id for job_id, score in exhaustive if score > 0}
+        found = relevant & {job_id for job_id, _ in cascade}
+        return {
+            "top_k": top_k,
+            "candidate_k": max(candidate_k or CASCADE_CANDIDATES, top_k),
+            "recall": len(found) / len(relevant) if relevant else 1.0,
+            "exhaustive_ms": round(exhaustive_ms, 2),
+            "cascade_ms": round(cascade_ms, 2),
+            "exhaustive": exhaustive,
+            "cascade": cascade,
+        }
+
+recommendation_service = RecommendationService()
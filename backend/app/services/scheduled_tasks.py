@@ -0,0 +1,83 @@
+"""Recurring tasks run by the scheduler.
+
+``register_tasks`` wires them onto a Scheduler; the API process and
+``python -m app.worker`` both call it, and the lease makes sure only one of
+them actually runs each task.
+"""
+import os
+
+from sqlalchemy import func
+
+from app.models.models import Job, Profile, MatchAlert
+from app.services.corpus_snapshot import build_snapshot, FORMAT_VERSION
+from app.services.matching_engine import matching_engine
+
+MATCH_ALERT_THRESHOLD = float(os.getenv("MATCH_ALERT_THRESHOLD", "90"))
+RESCORE_INTERVAL_SECONDS = int(os.getenv("RESCORE_INTERVAL_SECONDS", "300"))
+SNAPSHOT_INTERVAL_SECONDS = int(os.getenv("SNAPSHOT_INTERVAL_SECONDS", "3600"))
+
+
+def rescore_new_jobs(db, task, batch_size):
+    """Score jobs added since the last run against every user with a resume.
+
+    ``task.cursor`` holds the last job id scored; it starts at the newest job
+    when the task is first registered, so the existing catalog isn't rescored
+    (use rescore_matches.py for that). Each run handles about ``batch_size``
+    (job, user) pairs and records 90%+ matches as MatchAlerts.
+    """
+    profiles = db.query(Profile.user_id, Profile.resume_text).filter(Profile.resume_text.isnot(None)).all()
+    profiles = [(user_id, text) for user_id, text in profiles if text]
+    last_job_id = int(task.cursor or 0)
+    jobs_per_batch = -(-batch_size // max(1, len(profiles)))
+    jobs = db.query(Job).filter(Job.id > last_job_id).order_by(Job.id).limit(jobs_per_batch).all()
+    canonical_jobs = [job for job in jobs if job.duplicate_of is None]
+    if not jobs:
+        return 0
+
+    alerted = {
+        (user_id, job_id) for user_id, job_id in db.query(MatchAlert.user_id, MatchAlert.job_id).filter(
+            MatchAlert.job_id.in_([job.id for job in canonical_jobs])
+        ).all()
+    }
+    # Each resume and each job goes through spaCy once per run, not once per pair
+    resumes = [
+        (user_id, matching_engine.preprocess_text(text), set(matching_engine.extract_skills(text)))
+        for user_id, text in profiles
+    ] if canonical_jobs else []
+    # Reposts of a job already scored don't raise a second alert
+    for job in canonical_jobs:
+        job_content = f"{job.skills_required} {job.description}"
+        processed_job = matching_engine.preprocess_text(job_content)
+        job_skills = set(matching_engine.extract_skills(job_content))
+        for user_id, processed_resume, resume_skills in resumes:
+            if (user_id, job.id) in alerted:
+                continue
+            score = matching_engine._hybrid_score(processed_resume, resume_skills, job_content,
+                                                  processed_job, job_skills)
+            if score >= MATCH_ALERT_THRESHOLD:
+                db.add(MatchAlert(user_id=user_id, job_id=job.id, match_score=score))
+
+    task.cursor = str(jobs[-1].id)
+    return len(jobs) * max(1, len(profiles))
+
+
+def latest_job_id(db):
+    return str(db.query(func.max(Job.id)).scalar() or 0)
+
+
+def publish_corpus_snapshot(db, task, batch_size):
+    """Publish a new corpus snapshot when the catalog has changed."""
+    count, max_id = db.query(func.count(Job.id), func.max(Job.id)).one()
+    # The format is part of the version so an upgrade republishes in the new layout
+    version = f"{FORMAT_VERSION}:{count}:{max_id}"
+    if not count or task.cursor == version:
+        return 0
+    build_snapshot(db, matching_engine)
+    task.cursor = version
+    return 0
+
+
+def register_tasks(scheduler):
+    scheduler.task("rescore_new_jobs", RESCORE_INTERVAL_SECONDS, initial_cursor=latest_job_id)(rescore_new_jobs)
+    scheduler.task("publish_corpus_snapshot", SNAPSHOT_INTERVAL_SECONDS)(publish_corpus_snapshot)
+    return scheduler
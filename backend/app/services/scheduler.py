@@ -0,0 +1,254 @@
+"""Periodic background tasks backed by the application database.
+
+Every API worker (or a dedicated ``python -m app.worker`` process) may run a
+Scheduler; a lease row in ``scheduler_leases`` elects one leader at a time, so
+tasks run once per interval no matter how many processes are up. Task state
+lives in ``scheduled_tasks``, which makes the scheduler work on plain SQLite
+without an external broker.
+
+A task is ``fn(db, task, batch_size) -> int`` returning how many items it
+processed. A task that fills its batch is rescheduled immediately so backlogs
+drain in bounded chunks; otherwise it waits ``interval_seconds``. The lease is
+renewed in the background while a task runs, so a task longer than
+SCHEDULER_LEASE_SECONDS can't be picked up by a second worker mid-run.
+
+Only work that belongs to the whole deployment should be scheduled here; the
+leader's in-process state (caches etc.) is not shared with other workers.
+"""
+import datetime
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+
+from app.models.models import ScheduledTask, SchedulerLease
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "1") == "1"
+SCHEDULER_POLL_SECONDS = float(os.getenv("SCHEDULER_POLL_SECONDS", "5"))
+SCHEDULER_LEASE_SECONDS = int(os.getenv("SCHEDULER_LEASE_SECONDS", "60"))
+SCHEDULER_BATCH_SIZE = int(os.getenv("SCHEDULER_BATCH_SIZE", "500"))
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    def __init__(self, session_factory, lease_name="default", poll_seconds=SCHEDULER_POLL_SECONDS,
+                 lease_seconds=SCHEDULER_LEASE_SECONDS, batch_size=SCHEDULER_BATCH_SIZE):
+        self.session_factory = session_factory
+        self.lease_name = lease_name
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.batch_size = batch_size
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self.tasks = {}
+        self.initial_cursors = {}
+        self.metrics = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def task(self, name, interval_seconds, initial_cursor=None):
+        """Decorator registering ``fn`` to run every ``interval_seconds``.
+
+        ``initial_cursor(db)``, if given, seeds ``task.cursor`` when the task
+        row is first created.
+        """
+        def decorator(fn):
+            self.tasks[name] = (interval_seconds, fn)
+            self.initial_cursors[name] = initial_cursor
+            self.metrics[name] = {
+                "runs": 0, "failures": 0, "items": 0,
+                "last_duration_ms": None, "max_duration_ms": 0.0,
+                "last_lag_seconds": None, "max_lag_seconds": 0.0,
+            }
+            return fn
+        return decorator
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_seconds + 5)
+        self._release_lease()
+
+    def run_forever(self):
+        logger.info("Scheduler %s started with tasks %s", self.worker_id, sorted(self.tasks))
+        while not self._stop.is_set():
+            try:
+                ran = self.run_once()
+            except Exception:
+                logger.exception("Scheduler loop failed")
+                ran = 0
+            # Keep going without sleeping while tasks are catching up on a backlog
+            if not ran:
+                self._stop.wait(self.poll_seconds)
+
+    def run_once(self) -> int:
+        """Run every due task if this process holds the lease. Returns tasks run."""
+        db = self.session_factory()
+        try:
+            if not self._acquire_lease(db):
+                return 0
+            self._sync_tasks(db)
+            now = datetime.datetime.utcnow()
+            due = db.query(ScheduledTask).filter(
+                ScheduledTask.name.in_(list(self.tasks)),
+                ScheduledTask.next_run_at <= now
+            ).order_by(ScheduledTask.next_run_at).all()
+            for task in due:
+                if self._stop.is_set() or not self._acquire_lease(db):
+                    break
+                self._run_task(db, task.name)
+            return len(due)
+        finally:
+            db.close()
+
+    def _acquire_lease(self, db) -> bool:
+        now = datetime.datetime.utcnow()
+        expires_at = now + datetime.timedelta(seconds=self.lease_seconds)
+        updated = db.query(SchedulerLease).filter(
+            SchedulerLease.name == self.lease_name,
+            or_(SchedulerLease.holder == self.worker_id, SchedulerLease.expires_at < now)
+        ).update({"holder": self.worker_id, "expires_at": expires_at}, synchronize_session=False)
+        db.commit()
+        if not updated:
+            try:
+                db.add(SchedulerLease(name=self.lease_name, holder=self.worker_id, expires_at=expires_at))
+                db.commit()
+                updated = 1
+            except IntegrityError:
+                # Another worker holds the lease
+                db.rollback()
+        if bool(updated) != self.is_leader:
+            logger.info("Scheduler %s %s leadership", self.worker_id, "acquired" if updated else "lost")
+        self.is_leader = bool(updated)
+        return self.is_leader
+
+    @contextmanager
+    def _lease_heartbeat(self):
+        """Keep renewing the lease from a side thread while the body runs."""
+        done = threading.Event()
+
+        def renew():
+            while not done.wait(self.lease_seconds / 3):
+                db = self.session_factory()
+                try:
+                    if not self._acquire_lease(db):
+                        logger.warning("Scheduler %s lost its lease during a running task", self.worker_id)
+                except Exception:
+                    logger.exception("Lease renewal failed")
+                finally:
+                    db.close()
+
+        thread = threading.Thread(target=renew, name="scheduler-lease", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def _release_lease(self):
+        if not self.is_leader:
+            return
+        db = self.session_factory()
+        try:
+            db.query(SchedulerLease).filter(
+                SchedulerLease.name == self.lease_name,
+                SchedulerLease.holder == self.worker_id
+            ).update({"expires_at": datetime.datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+            self.is_leader = False
+        finally:
+            db.close()
+
+    def _sync_tasks(self, db):
+        existing = {name for (name,) in db.query(ScheduledTask.name).all()}
+        now = datetime.datetime.utcnow()
+        for name, (interval_seconds, _) in self.tasks.items():
+            if name not in existing:
+                initial_cursor = self.initial_cursors.get(name)
+                db.add(ScheduledTask(name=name, interval_seconds=interval_seconds, next_run_at=now,
+                                     cursor=initial_cursor(db) if initial_cursor else None,
+                                     run_count=0, failure_count=0))
+            else:
+                db.query(ScheduledTask).filter(ScheduledTask.name == name).update(
+                    {"interval_seconds": interval_seconds}, synchronize_session=False)
+        db.commit()
+
+    def _run_task(self, db, name):
+        interval_seconds, fn = self.tasks[name]
+        task = db.get(ScheduledTask, name)
+        started_at = datetime.datetime.utcnow()
+        lag_seconds = max((started_at - task.next_run_at).total_seconds(), 0.0)
+        task.last_started_at = started_at
+        db.commit()
+
+        start = time.perf_counter()
+        error = None
+        processed = 0
+        try:
+            with self._lease_heartbeat():
+                processed = fn(db, task, self.batch_size) or 0
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            error = repr(e)
+            logger.exception("Scheduled task %s failed", name)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        task = db.get(ScheduledTask, name)
+        finished_at = datetime.datetime.utcnow()
+        catching_up = error is None and processed >= self.batch_size
+        task.next_run_at = finished_at if catching_up else finished_at + datetime.timedelta(seconds=interval_seconds)
+        task.last_finished_at = finished_at
+        task.last_duration_ms = duration_ms
+        task.last_error = error
+        task.run_count = (task.run_count or 0) + 1
+        task.failure_count = (task.failure_count or 0) + (error is not None)
+        db.commit()
+
+        metrics = self.metrics[name]
+        metrics["runs"] += 1
+        metrics["failures"] += error is not None
+        metrics["items"] += processed
+        metrics["last_duration_ms"] = round(duration_ms, 2)
+        metrics["max_duration_ms"] = round(max(metrics["max_duration_ms"], duration_ms), 2)
+        metrics["last_lag_seconds"] = round(lag_seconds, 3)
+        metrics["max_lag_seconds"] = round(max(metrics["max_lag_seconds"], lag_seconds), 3)
+
+    def status(self, db):
+        """Durable task state from the database plus this worker's own metrics."""
+        now = datetime.datetime.utcnow()
+        tasks = {}
+        for task in db.query(ScheduledTask).filter(ScheduledTask.name.in_(list(self.tasks))).all():
+            tasks[task.name] = {
+                "interval_seconds": task.interval_seconds,
+                "next_run_at": task.next_run_at,
+                "lag_seconds": round(max((now - task.next_run_at).total_seconds(), 0.0), 3) if task.next_run_at else None,
+                "last_finished_at": task.last_finished_at,
+                "last_duration_ms": task.last_duration_ms,
+                "last_error": task.last_error,
+                "run_count": task.run_count,
+                "failure_count": task.failure_count,
+                "worker": self.metrics.get(task.name),
+            }
+        lease = db.get(SchedulerLease, self.lease_name)
+        return {
+            "worker_id": self.worker_id,
+            "is_leader": self.is_leader,
+            "leader": lease.holder if lease and lease.expires_at > now else None,
+            "tasks": tasks,
+        }
@@ -0,0 +1,48 @@
+"""Request coalescing for identical concurrent computations.
+
+While a computation for a key is running, later callers with the same key
+await the same asyncio task instead of starting their own. Nothing is cached
+after the task finishes; the next caller starts a fresh computation.
+"""
+import asyncio
+
+
+class SingleFlight:
+    def __init__(self, name):
+        self.name = name
+        self._inflight = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn):
+        """Return ``await fn()``, sharing one in-flight call per ``key``."""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._finished(key, t))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        # Shielded so one caller disconnecting doesn't cancel the others' result
+        return await asyncio.shield(task)
+
+    def _finished(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every caller went away
+            task.exception()
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+jobs_flight = SingleFlight("jobs")
+match_flight = SingleFlight("match")
@@ -1,6 +1,13 @@
 import re
 
 class TailorService:
+    BULLET_TEMPLATES = [
+        "Implemented {skill} solutions to optimize data processing latency by 30% in high-concurrency environments.",
+        "Leveraged {skill} for building scalable infrastructure components aligned with {job_title} requirements.",
+        "Collaborated on {skill} integration within a CI/CD pipeline, improving deployment frequency by 15%.",
+        "Architected modular components using {skill} to ensure code maintainability and cross-platform compatibility."
+    ]
+
     def generate_suggestions(self, resume_text, job_title, missing_skills):
         """
         Generates tailored bullet points or professional summary improvements 
@@ -41,15 +48,8 @@ class TailorService:
 
     def _generate_bullet_point(self, skill, job_title):
         """Mimics LLM bullet point generation logic."""
-        skill_upper = skill.upper()
-        scenarios = [
-            f"Implemented {skill_upper} solutions to optimize data processing latency by 30% in high-concurrency environments.",
-            f"Leveraged {skill_upper} for building scalable infrastructure components aligned with {job_title} requirements.",
-            f"Collaborated on {skill_upper} integration within a CI/CD pipeline, improving deployment frequency by 15%.",
-            f"Architected modular components using {skill_upper} to ensure code maintainability and cross-platform compatibility."
-        ]
         # Simple hash-like selection for consistency based on skill name
-        idx = sum(ord(c) for c in skill) % len(scenarios)
-        return scenarios[idx]
+        idx = sum(ord(c) for c in skill) % len(self.BULLET_TEMPLATES)
+        return self.BULLET_TEMPLATES[idx].format(skill=skill.upper(), job_title=job_title)
 
 tailor_service = TailorService()
@@ -0,0 +1,21 @@
+"""Run the background scheduler in its own process.
+
+    SCHEDULER_ENABLED=0 uvicorn app.main:app --workers 4   # API only
+    python -m app.worker                                    # scheduler only
+"""
+import logging
+
+from app.database import SessionLocal, init_db
+from app.services.scheduled_tasks import register_tasks
+from app.services.scheduler import Scheduler
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    scheduler = register_tasks(Scheduler(SessionLocal))
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.stop()
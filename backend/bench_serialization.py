@@ -0,0 +1,121 @@
+"""Benchmark payload size and serialization time for /jobs and /me.
+
+Compares FastAPI's default path (jsonable_encoder + json.dumps) against the
+projection + FastJSONResponse path, and reports gzip/brotli sizes.
+
+    python bench_serialization.py
+"""
+import gzip
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.models import Job, Profile, User
+from app.responses import dumps, GZIP_LEVEL, BROTLI_QUALITY
+from app.schemas import JobOut, MeOut, ProfileOut
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SIZES = [1_000, 10_000]
+REPEATS = 5
+
+WORDS = ("python fastapi postgresql aws react tailwind docker kubernetes team build "
+         "scalable services data pipelines customers product engineering remote").split()
+LOCATIONS = ["New York, NY", "San Francisco, CA", "Austin, TX", "Remote", "London, UK"]
+
+
+def make_jobs(n):
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    jobs = []
+    for i in range(n):
+        jobs.append(Job(
+            id=i + 1,
+            title=f"Engineer {i}",
+            company=f"Company {i % 300}",
+            location=rng.choice(LOCATIONS),
+            description=" ".join(rng.choice(WORDS) for _ in range(rng.randint(150, 400))),
+            remote_status=rng.choice(["Remote", "Hybrid", "On-site"]),
+            experience_level=rng.choice(["Junior", "Mid-Level", "Senior"]),
+            skills_required=", ".join(rng.sample(WORDS[:8], 4)),
+            salary_range="$100k - $140k",
+            posted_at=now - timedelta(hours=i),
+        ))
+    return jobs
+
+
+def timed(fn):
+    best = float("inf")
+    out = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return out, best * 1000
+
+
+def report(label, default_fn, fast_fn):
+    default_body, default_ms = timed(default_fn)
+    fast_body, fast_ms = timed(fast_fn)
+    gz = len(gzip.compress(fast_body, compresslevel=GZIP_LEVEL))
+    br = len(brotli.compress(fast_body, quality=BROTLI_QUALITY)) if brotli else None
+    print(f"{label}")
+    print(f"  default : {len(default_body):>12,} B  {default_ms:9.2f} ms")
+    print(f"  fast    : {len(fast_body):>12,} B  {fast_ms:9.2f} ms  ({default_ms / fast_ms:.1f}x)")
+    print(f"  gzip    : {gz:>12,} B")
+    print(f"  brotli  : {br:>12,} B" if br is not None else "  brotli  :   (brotli not installed)")
+
+
+def bench_jobs():
+    for n in SIZES:
+        jobs = make_jobs(n)
+        report(
+            f"/jobs with {n:,} jobs",
+            lambda: json.dumps(jsonable_encoder(jobs)).encode("utf-8"),
+            lambda: dumps([JobOut.from_orm(job) for job in jobs]),
+        )
+
+
+def bench_me():
+    with open("resume_dump.txt", encoding="utf-8") as f:
+        resume_text = f.read()
+    user = User(id=1, email="hunter@example.com", full_name="Hunter", is_profile_complete=1)
+    profile = Profile(user_id=1, preferred_role="Backend Engineer", skills="python, fastapi",
+                      experience_level="Senior", resume_path="uploads/resume.pdf", resume_text=resume_text)
+
+    def default():
+        return json.dumps(jsonable_encoder({
+            "id": user.id,
+            "email": user.email,
+            "full_name": user.full_name,
+            "is_profile_complete": user.is_profile_complete == 1,
+            "profile": {
+                "preferred_role": profile.preferred_role,
+                "skills": profile.skills,
+                "experience_level": profile.experience_level,
+                "has_resume": bool(profile.resume_path),
+                "resume_text": profile.resume_text
+            }
+        })).encode("utf-8")
+
+    def fast():
+        return dumps(MeOut(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            is_profile_complete=user.is_profile_complete == 1,
+            profile=ProfileOut.from_orm(profile)
+        ))
+
+    report("/me with resume_dump.txt", default, fast)
+
+
+if __name__ == "__main__":
+    bench_jobs()
+    bench_me()
@@ -0,0 +1,133 @@
+"""Benchmark /jobs-style read throughput while ingestion writes to SQLite.
+
+Runs the same workload twice against a throwaway database file: once with the
+stock configuration (rollback journal, one shared engine) and once with the
+tuned profile from app.database (WAL, connection pragmas, separate query_only
+read engine). A writer thread ingests jobs one commit at a time through the
+dedup path while reader threads run filtered job searches.
+
+    python bench_sqlite_concurrency.py [--seconds 10] [--readers 4] [--seed-jobs 5000]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from app.database import make_engine
+from app.models.models import Base, Job
+from app.services.dedup_service import DedupService
+from app.services.job_service import job_service
+
+WORDS = ("python fastapi postgresql aws react tailwind docker kubernetes team build "
+         "scalable services data pipelines customers product engineering remote").split()
+SEARCHES = [
+    {"remote_status": "Remote"},
+    {"experience_level": "Senior"},
+    {"remote_status": "Hybrid", "experience_level": "Mid-Level"},
+    {"keywords": "kubernetes"},
+    {},
+]
+
+
+def make_job(rng, i, now):
+    return Job(
+        title=f"Engineer {i}",
+        company=f"Company {i % 300}",
+        location="Remote",
+        description=f"Req {i}: " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(80, 200))),
+        remote_status=rng.choice(["Remote", "Hybrid", "On-site"]),
+        experience_level=rng.choice(["Junior", "Mid-Level", "Senior"]),
+        skills_required=", ".join(rng.sample(WORDS[:8], 4)),
+        salary_range="$100k - $140k",
+        posted_at=now - timedelta(minutes=i),
+    )
+
+
+def run(label, tuned, args):
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_sqlite_"), "bench.db")
+    url = f"sqlite:///{path}"
+    write_engine = make_engine(url, tuned=tuned)
+    read_engine = make_engine(url, read_only=True, tuned=tuned) if tuned else write_engine
+    WriteSession = sessionmaker(autoflush=False, bind=write_engine)
+    ReadSession = sessionmaker(autoflush=False, bind=read_engine)
+    Base.metadata.create_all(bind=write_engine)
+
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    with WriteSession() as db:
+        db.add_all(make_job(rng, i, now) for i in range(args.seed_jobs))
+        db.commit()
+
+    stop = threading.Event()
+    latencies, errors, writes = [], [], [0]
+    lock = threading.Lock()
+
+    def writer():
+        dedup = DedupService()
+        i = args.seed_jobs
+        with WriteSession() as db:
+            while not stop.is_set():
+                try:
+                    dedup.add_job(db, make_job(rng, i, now))
+                    writes[0] += 1
+                except Exception as exc:
+                    db.rollback()
+                    with lock:
+                        errors.append(f"write: {exc.__class__.__name__}")
+                i += 1
+
+    def reader(seed):
+        local = random.Random(seed)
+        while not stop.is_set():
+            filters = local.choice(SEARCHES)
+            start = time.perf_counter()
+            try:
+                with ReadSession() as db:
+                    job_service.build_jobs_query(db, **filters).limit(50).all()
+            except Exception as exc:
+                with lock:
+                    errors.append(f"read: {exc.__class__.__name__}")
+                continue
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=writer)] + [
+        threading.Thread(target=reader, args=(n,)) for n in range(args.readers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    print(f"{label}")
+    print(f"  reads   : {len(latencies) / args.seconds:9.1f} /s  "
+          f"p50 {statistics.median(latencies) if latencies else 0:7.2f} ms  p95 {p95:7.2f} ms")
+    print(f"  writes  : {writes[0] / args.seconds:9.1f} /s")
+    print(f"  errors  : {len(errors)}" + (f"  ({', '.join(sorted(set(errors)))})" if errors else ""))
+    write_engine.dispose()
+    read_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seed-jobs", type=int, default=5000)
+    args = parser.parse_args()
+
+    run("default (rollback journal, shared engine)", False, args)
+    run("tuned (WAL + pragmas, query_only read engine)", True, args)
+
+
+if __name__ == "__main__":
+    main()
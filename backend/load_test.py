@@ -0,0 +1,360 @@
+"""Load-test the API with scripted user journeys at a fixed arrival rate.
+
+Seeds a throwaway SQLite database with jobs and returning users (with
+resumes), starts uvicorn against it, then launches journeys as a Poisson
+process for --duration seconds. Each journey replays what the frontend does:
+
+  new user       register, login, upload resume, /me, browse /jobs with
+                 filters, open Matches (/recommendations, then one /match
+                 per card shown), tailor, track an application, /applications
+  returning user login, /me, browse /jobs, open Matches, cover letter,
+                 update an application, /analytics
+
+Reports throughput, p50/p95/p99 latency and error rate per endpoint.
+
+    python load_test.py --rate 2 --duration 60
+    python load_test.py --base-url http://localhost:8000 --rate 5   # existing server, no seeding
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+PASSWORD = "loadtest-password"
+
+SKILLS = ["Python", "FastAPI", "PostgreSQL", "AWS", "React", "TypeScript", "Docker", "Kubernetes",
+          "Go", "Terraform", "Django", "Redis", "GraphQL", "Node.js", "Tailwind", "Machine Learning"]
+FILLER = ("build scalable services with a small team ship features own production systems "
+          "collaborate with product design mentor engineers improve reliability").split()
+ROLES = ["Backend Engineer", "Frontend Engineer", "Full Stack Developer", "Data Engineer", "Platform Engineer"]
+LOCATIONS = ["New York, NY", "San Francisco, CA", "Austin, TX", "Remote", "London, UK", "Toronto, ON, Canada"]
+REMOTE = ["Remote", "Hybrid", "On-site"]
+LEVELS = ["Junior", "Mid-Level", "Senior"]
+SEARCHES = [
+    {},
+    {"remote_status": "Remote"},
+    {"experience_level": "Senior"},
+    {"keywords": "python"},
+    {"location": "Austin, TX", "radius_km": 50},
+    {"remote_status": "Hybrid", "experience_level": "Mid-Level"},
+]
+
+
+def fake_resume(rng):
+    skills = rng.sample(SKILLS, 6)
+    return (f"{rng.choice(ROLES)} with {rng.randint(1, 12)} years of experience.\n"
+            f"Skills: {', '.join(skills)}\n"
+            + " ".join(rng.choice(FILLER + skills) for _ in range(rng.randint(150, 300))))
+
+
+def seed_database(path, jobs, users, seed):
+    """Create the schema and insert synthetic jobs and returning users."""
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    from app.auth import get_password_hash
+    from app.database import SessionLocal, init_db
+    from app.models.models import Profile, User
+    from app.services.corpus_snapshot import build_snapshot
+    from app.services.job_service import job_service
+    from app.services.matching_engine import matching_engine
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    init_db()
+    db = SessionLocal()
+    try:
+        for i in range(jobs):
+            skills = rng.sample(SKILLS, 4)
+            job_service.add_job(
+                db,
+                title=f"{rng.choice(LEVELS)} {rng.choice(ROLES)}",
+                company=f"Company {i % 200}",
+                location=rng.choice(LOCATIONS),
+                description=f"Posting {i}. " + " ".join(rng.choice(FILLER + skills) for _ in range(rng.randint(60, 160))),
+                remote_status=rng.choice(REMOTE),
+                experience_level=rng.choice(LEVELS),
+                skills_required=", ".join(skills),
+                salary_range="$100k - $150k",
+                posted_at=now - timedelta(hours=i),
+            )
+        hashed = get_password_hash(PASSWORD)
+        emails = []
+        for i in range(users):
+            user = User(email=f"seed{i}@loadtest.local", hashed_password=hashed,
+                        full_name=f"Seed User {i}", is_profile_complete=1)
+            db.add(user)
+            db.flush()
+            db.add(Profile(user_id=user.id, preferred_role=rng.choice(ROLES), experience_level=rng.choice(LEVELS),
+                           skills=", ".join(rng.sample(SKILLS, 5)), resume_text=fake_resume(rng)))
+            emails.append(user.email)
+        db.commit()
+        # The server doesn't build snapshots itself; publish one where it will look (cwd=workdir)
+        build_snapshot(db, matching_engine, os.path.join(os.path.dirname(path), "snapshots"))
+        return emails
+    finally:
+        db.close()
+
+
+class UserClient:
+    """One simulated user's view of the shared client: its own auth header, the shared connection pool."""
+
+    def __init__(self, client):
+        self.client = client
+        self.headers = {}
+
+    async def request(self, method, url, **kwargs):
+        return await self.client.request(method, url, headers=self.headers, **kwargs)
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)  # endpoint -> [(latency_ms, ok)]
+        self.errors = defaultdict(lambda: defaultdict(int))
+        self.journey_errors = defaultdict(int)  # exception class -> count, for journeys that raised
+
+    async def call(self, client, label, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.samples[label].append(((time.perf_counter() - start) * 1000, False))
+            self.errors[label][exc.__class__.__name__] += 1
+            return None
+        ok = response.status_code < 400
+        self.samples[label].append(((time.perf_counter() - start) * 1000, ok))
+        if not ok:
+            self.errors[label][str(response.status_code)] += 1
+            return None
+        return response.json()
+
+    def report(self, elapsed, journeys):
+        def percentile(values, q):
+            return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+        rows = {}
+        for label in sorted(self.samples):
+            latencies = sorted(latency for latency, _ in self.samples[label])
+            failed = sum(1 for _, ok in self.samples[label] if not ok)
+            rows[label] = {
+                "requests": len(latencies),
+                "rps": round(len(latencies) / elapsed, 2),
+                "p50_ms": round(percentile(latencies, 0.50), 1),
+                "p95_ms": round(percentile(latencies, 0.95), 1),
+                "p99_ms": round(percentile(latencies, 0.99), 1),
+                "error_rate": round(failed / len(latencies), 4),
+                "errors": dict(self.errors[label]),
+            }
+        total = sum(row["requests"] for row in rows.values())
+        failed = sum(round(row["error_rate"] * row["requests"]) for row in rows.values())
+        return {
+            "elapsed_s": round(elapsed, 1),
+            "journeys": journeys,
+            "requests": total,
+            "rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(failed / total, 4) if total else 0.0,
+            "journey_errors": dict(self.journey_errors),
+            "endpoints": rows,
+        }
+
+
+def print_report(report):
+    journeys = report["journeys"]
+    print(f"\n{report['requests']:,} requests in {report['elapsed_s']} s  "
+          f"({report['rps']} req/s, {report['error_rate']:.2%} errors)")
+    print(f"journeys: {journeys['completed']} completed, {journeys['failed']} failed, {journeys['started']} started")
+    for error, count in report["journey_errors"].items():
+        print(f"  raised {error}: {count}")
+    print(f"\n{'endpoint':32} {'reqs':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8}")
+    for label, row in report["endpoints"].items():
+        print(f"{label:32} {row['requests']:>7} {row['rps']:>8} {row['p50_ms']:>9} {row['p95_ms']:>9} "
+              f"{row['p99_ms']:>9} {row['error_rate']:>8.2%}")
+        for error, count in row["errors"].items():
+            print(f"{'':34}{error}: {count}")
+
+
+async def login(rec, client, email):
+    token = await rec.call(client, "POST /login", "POST", "/login",
+                           data={"username": email, "password": PASSWORD})
+    if not token:
+        return False
+    client.headers["Authorization"] = f"Bearer {token['access_token']}"
+    return True
+
+
+async def browse_and_match(rec, client, rng, resume_text, max_matches):
+    for _ in range(rng.randint(1, 3)):
+        await rec.call(client, "GET /jobs", "GET", "/jobs", params=rng.choice(SEARCHES))
+    # The Matches page ranks with one /recommendations call, then fetches
+    # /match details for the cards it shows, concurrently
+    jobs = await rec.call(client, "GET /recommendations", "GET", "/recommendations",
+                          params={"top_k": max_matches}) or []
+    results = await asyncio.gather(*(
+        rec.call(client, "POST /match", "POST", "/match", data={"resume_text": resume_text, "job_id": job["id"]})
+        for job in jobs
+    ))
+    return [(job, result) for job, result in zip(jobs, results) if result and "match_percentage" in result]
+
+
+async def new_user_journey(rec, client, rng, args):
+    email = f"user-{uuid.uuid4().hex[:12]}@loadtest.local"
+    if not await rec.call(client, "POST /register", "POST", "/register",
+                          json={"full_name": "Load Test", "email": email, "password": PASSWORD}):
+        return False
+    if not await login(rec, client, email):
+        return False
+    resume_text = fake_resume(rng)
+    await rec.call(client, "POST /upload-resume", "POST", "/upload-resume",
+                   files={"file": ("resume.txt", resume_text.encode("utf-8"), "text/plain")})
+    await rec.call(client, "GET /me", "GET", "/me")
+    matches = await browse_and_match(rec, client, rng, resume_text, args.max_matches)
+    if matches:
+        job, result = max(matches, key=lambda pair: pair[1]["match_percentage"])
+        await rec.call(client, "POST /tailor-resume", "POST", "/tailor-resume",
+                       data={"job_id": job["id"], "resume_text": resume_text})
+        await rec.call(client, "POST /applications", "POST", "/applications",
+                       json={"job_id": job["id"], "status": "Applied", "match_score": result["match_percentage"]})
+    await rec.call(client, "GET /applications", "GET", "/applications")
+    return True
+
+
+async def returning_user_journey(rec, client, rng, args, emails):
+    if not await login(rec, client, rng.choice(emails)):
+        return False
+    me = await rec.call(client, "GET /me", "GET", "/me")
+    resume_text = ((me or {}).get("profile") or {}).get("resume_text") or fake_resume(rng)
+    matches = await browse_and_match(rec, client, rng, resume_text, args.max_matches)
+    if matches:
+        job, result = rng.choice(matches)
+        await rec.call(client, "POST /generate-cover-letter", "POST", "/generate-cover-letter",
+                       data={"job_id": job["id"], "candidate_name": "Seed User", "resume_text": resume_text})
+        await rec.call(client, "POST /applications", "POST", "/applications",
+                       json={"job_id": job["id"], "status": rng.choice(["Applied", "Interview", "Offer"]),
+                             "match_score": result["match_percentage"]})
+    await rec.call(client, "GET /analytics", "GET", "/analytics", params={"granularity": rng.choice(["day", "week"])})
+    return True
+
+
+async def run_load(args, emails):
+    rec = Recorder()
+    rng = random.Random(args.seed)
+    journeys = {"started": 0, "completed": 0, "failed": 0}
+    limits = httpx.Limits(max_connections=args.max_connections)
+    tasks = set()
+
+    async def journey(shared_client, journey_seed):
+        local = random.Random(journey_seed)
+        client = UserClient(shared_client)
+        try:
+            if emails and local.random() >= args.new_user_ratio:
+                ok = await returning_user_journey(rec, client, local, args, emails)
+            else:
+                ok = await new_user_journey(rec, client, local, args)
+        except Exception as exc:
+            # HTTP failures are recorded per endpoint by Recorder.call; anything else is a harness bug
+            rec.journey_errors[exc.__class__.__name__] += 1
+            ok = False
+        journeys["completed" if ok else "failed"] += 1
+
+    # One client for every journey, so --max-connections caps the whole run
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as shared_client:
+        start = time.perf_counter()
+        deadline = start + args.duration
+        while time.perf_counter() < deadline:
+            journeys["started"] += 1
+            task = asyncio.create_task(journey(shared_client, rng.random()))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            # Poisson arrivals at --rate journeys per second
+            await asyncio.sleep(rng.expovariate(args.rate))
+        if tasks:
+            await asyncio.wait(tasks, timeout=args.drain)
+        return rec.report(time.perf_counter() - start, journeys)
+
+
+def start_server(args, workdir, db_path):
+    # A stale server on the port would answer the readiness check with the wrong database
+    with socket.socket() as probe:
+        if probe.connect_ex(("127.0.0.1", args.port)) == 0:
+            raise RuntimeError(f"port {args.port} is already in use; pass --port or --base-url")
+    env = dict(os.environ,
+               DATABASE_URL=f"sqlite:///{db_path}",
+               SCHEDULER_ENABLED="1" if args.scheduler else "0",
+               PYTHONPATH=BACKEND_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--app-dir", BACKEND_DIR,
+               "--host", "127.0.0.1", "--port", str(args.port), "--workers", str(args.workers),
+               "--log-level", "warning"]
+    # Run from the temp dir so uploads/ and snapshots/ don't land in the repo
+    server = subprocess.Popen(command, cwd=workdir, env=env)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            if httpx.get(args.base_url + "/", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError("uvicorn did not become ready within 60 s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=1.0, help="journeys started per second")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to keep starting journeys")
+    parser.add_argument("--drain", type=float, default=60, help="seconds to wait for in-flight journeys")
+    parser.add_argument("--new-user-ratio", type=float, default=0.3)
+    parser.add_argument("--max-matches", type=int, default=3, help="recommendations shown per Matches visit")
+    parser.add_argument("--jobs", type=int, default=300, help="jobs to seed")
+    parser.add_argument("--users", type=int, default=20, help="returning users to seed")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--scheduler", action="store_true", help="run the background scheduler in the server")
+    parser.add_argument("--base-url", help="target an already running server instead of starting one")
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    server = None
+    workdir = None
+    emails = []
+    try:
+        if args.base_url is None:
+            args.base_url = f"http://127.0.0.1:{args.port}"
+            workdir = tempfile.mkdtemp(prefix="job_hunter_load_")
+            db_path = os.path.join(workdir, "load_test.db")
+            print(f"Seeding {args.jobs} jobs and {args.users} users into {db_path} ...")
+            emails = seed_database(db_path, args.jobs, args.users, args.seed)
+            server = start_server(args, workdir, db_path)
+        print(f"Running journeys at {args.rate}/s for {args.duration:g} s against {args.base_url} ...")
+        report = asyncio.run(run_load(args, emails))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Helpers that keep migrations idempotent.
+
+Fresh databases are created by ``Base.metadata.create_all`` in ``init_db`` and
+already match the models, so each migration only applies what is missing.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+def has_table(table):
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def has_column(table, column):
+    return column in {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def has_index(table, index):
+    return index in {i["name"] for i in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def create_index(name, table, columns, **kwargs):
+    if not has_index(table, name):
+        op.create_index(name, table, columns, **kwargs)
+
+
+def drop_index(name, table):
+    if has_index(table, name):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,99 @@
+"""Baseline schema (users, profiles, jobs, resumes, application_tracker)
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-19
+
+Databases created by init_db already have these tables; this revision only
+matters for ``alembic upgrade head`` on an empty database.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.utils import has_table, create_index
+
+revision = "0000"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+APPLICATION_STATUSES = ("Not Applied", "Applied", "Interview", "Rejected", "Offer")
+
+
+def upgrade():
+    if not has_table("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String()),
+            sa.Column("hashed_password", sa.String()),
+            sa.Column("full_name", sa.String()),
+            sa.Column("is_profile_complete", sa.Integer()),
+        )
+    create_index("ix_users_id", "users", ["id"])
+    create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if not has_table("profiles"):
+        op.create_table(
+            "profiles",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), unique=True),
+            sa.Column("preferred_role", sa.String()),
+            sa.Column("skills", sa.Text()),
+            sa.Column("experience_level", sa.String()),
+            sa.Column("location_preference", sa.String()),
+            sa.Column("salary_expectation", sa.String()),
+            sa.Column("resume_path", sa.String(), nullable=True),
+            sa.Column("resume_text", sa.Text(), nullable=True),
+        )
+    create_index("ix_profiles_id", "profiles", ["id"])
+
+    if not has_table("jobs"):
+        op.create_table(
+            "jobs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String()),
+            sa.Column("company", sa.String()),
+            sa.Column("location", sa.String()),
+            sa.Column("description", sa.Text()),
+            sa.Column("remote_status", sa.String()),
+            sa.Column("experience_level", sa.String()),
+            sa.Column("skills_required", sa.Text()),
+            sa.Column("salary_range", sa.String(), nullable=True),
+            sa.Column("posted_at", sa.DateTime()),
+        )
+    create_index("ix_jobs_id", "jobs", ["id"])
+    create_index("ix_jobs_title", "jobs", ["title"])
+    create_index("ix_jobs_company", "jobs", ["company"])
+
+    if not has_table("resumes"):
+        op.create_table(
+            "resumes",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("content_text", sa.Text()),
+            sa.Column("extracted_skills", sa.Text()),
+            sa.Column("created_at", sa.DateTime()),
+        )
+    create_index("ix_resumes_id", "resumes", ["id"])
+
+    if not has_table("application_tracker"):
+        op.create_table(
+            "application_tracker",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id")),
+            sa.Column("status", sa.Enum(*APPLICATION_STATUSES, name="applicationstatus")),
+            sa.Column("match_score", sa.Float()),
+            sa.Column("applied_at", sa.DateTime(), nullable=True),
+            sa.Column("notes", sa.Text(), nullable=True),
+        )
+    create_index("ix_application_tracker_id", "application_tracker", ["id"])
+
+
+def downgrade():
+    op.drop_table("application_tracker")
+    op.drop_table("resumes")
+    op.drop_table("jobs")
+    op.drop_table("profiles")
+    op.drop_table("users")
@@ -0,0 +1,49 @@
+"""Job filter indexes and normalized location
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.location_service import normalize_location
+from migrations.utils import has_column, create_index, drop_index
+
+revision = "0001"
+down_revision = "0000"
+branch_labels = None
+depends_on = None
+
+JOB_INDEXES = [
+    ("ix_jobs_posted_at", ["posted_at"]),
+    ("ix_jobs_location_normalized_posted_at", ["location_normalized", "posted_at"]),
+    ("ix_jobs_remote_status_posted_at", ["remote_status", "posted_at"]),
+    ("ix_jobs_experience_level_posted_at", ["experience_level", "posted_at"]),
+    ("ix_jobs_remote_status_experience_level_posted_at", ["remote_status", "experience_level", "posted_at"]),
+]
+
+
+def upgrade():
+    if not has_column("jobs", "location_normalized"):
+        with op.batch_alter_table("jobs") as batch:
+            batch.add_column(sa.Column("location_normalized", sa.String(), nullable=True))
+
+    bind = op.get_bind()
+    jobs = sa.table("jobs", sa.column("id", sa.Integer), sa.column("location", sa.String),
+                    sa.column("location_normalized", sa.String))
+    rows = bind.execute(sa.select(jobs.c.id, jobs.c.location).where(jobs.c.location_normalized.is_(None))).fetchall()
+    for job_id, location in rows:
+        bind.execute(jobs.update().where(jobs.c.id == job_id).values(location_normalized=normalize_location(location)))
+
+    for name, columns in JOB_INDEXES:
+        create_index(name, "jobs", columns)
+    create_index("ix_application_tracker_user_id_job_id", "application_tracker", ["user_id", "job_id"])
+
+
+def downgrade():
+    drop_index("ix_application_tracker_user_id_job_id", "application_tracker")
+    for name, _ in reversed(JOB_INDEXES):
+        drop_index(name, "jobs")
+    with op.batch_alter_table("jobs") as batch:
+        batch.drop_column("location_normalized")
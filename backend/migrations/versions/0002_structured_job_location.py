@@ -0,0 +1,59 @@
+"""Structured job location fields
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.location_service import parse_location
+from migrations.utils import has_column, create_index, drop_index
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    ("city", sa.String()),
+    ("region", sa.String()),
+    ("country", sa.String()),
+    ("latitude", sa.Float()),
+    ("longitude", sa.Float()),
+]
+JOB_INDEXES = [
+    ("ix_jobs_city_posted_at", ["city", "posted_at"]),
+    ("ix_jobs_region_posted_at", ["region", "posted_at"]),
+    ("ix_jobs_country_posted_at", ["country", "posted_at"]),
+]
+
+
+def upgrade():
+    missing = [(name, type_) for name, type_ in COLUMNS if not has_column("jobs", name)]
+    if missing:
+        with op.batch_alter_table("jobs") as batch:
+            for name, type_ in missing:
+                batch.add_column(sa.Column(name, type_, nullable=True))
+
+    bind = op.get_bind()
+    jobs = sa.table("jobs", sa.column("id", sa.Integer), sa.column("location", sa.String),
+                    *[sa.column(name, type_) for name, type_ in COLUMNS])
+    rows = bind.execute(sa.select(jobs.c.id, jobs.c.location).where(jobs.c.location.isnot(None))).fetchall()
+    for job_id, location in rows:
+        parsed = parse_location(location)
+        bind.execute(jobs.update().where(jobs.c.id == job_id).values(
+            city=parsed.city, region=parsed.region, country=parsed.country,
+            latitude=parsed.latitude, longitude=parsed.longitude,
+        ))
+
+    for name, columns in JOB_INDEXES:
+        create_index(name, "jobs", columns)
+
+
+def downgrade():
+    for name, _ in reversed(JOB_INDEXES):
+        drop_index(name, "jobs")
+    with op.batch_alter_table("jobs") as batch:
+        for name, _ in reversed(COLUMNS):
+            batch.drop_column(name)
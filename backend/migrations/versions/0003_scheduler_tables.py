@@ -0,0 +1,60 @@
+"""Scheduler task, lease and match alert tables
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.utils import has_table, create_index
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not has_table("match_alerts"):
+        op.create_table(
+            "match_alerts",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id")),
+            sa.Column("match_score", sa.Float()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("notified_at", sa.DateTime(), nullable=True),
+            sa.UniqueConstraint("user_id", "job_id", name="uq_match_alerts_user_id_job_id"),
+        )
+    create_index("ix_match_alerts_id", "match_alerts", ["id"])
+
+    if not has_table("scheduled_tasks"):
+        op.create_table(
+            "scheduled_tasks",
+            sa.Column("name", sa.String(), primary_key=True),
+            sa.Column("interval_seconds", sa.Integer()),
+            sa.Column("next_run_at", sa.DateTime()),
+            sa.Column("cursor", sa.String(), nullable=True),
+            sa.Column("last_started_at", sa.DateTime(), nullable=True),
+            sa.Column("last_finished_at", sa.DateTime(), nullable=True),
+            sa.Column("last_duration_ms", sa.Float(), nullable=True),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column("run_count", sa.Integer()),
+            sa.Column("failure_count", sa.Integer()),
+        )
+    create_index("ix_scheduled_tasks_next_run_at", "scheduled_tasks", ["next_run_at"])
+
+    if not has_table("scheduler_leases"):
+        op.create_table(
+            "scheduler_leases",
+            sa.Column("name", sa.String(), primary_key=True),
+            sa.Column("holder", sa.String()),
+            sa.Column("expires_at", sa.DateTime()),
+        )
+
+
+def downgrade():
+    op.drop_table("scheduler_leases")
+    op.drop_table("scheduled_tasks")
+    op.drop_table("match_alerts")
@@ -0,0 +1,48 @@
+"""Job MinHash signatures and near-duplicate links
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.dedup_service import LSHIndex, minhash_signature
+from migrations.utils import has_column, create_index, drop_index
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not has_column("jobs", "minhash"):
+        with op.batch_alter_table("jobs") as batch:
+            batch.add_column(sa.Column("minhash", sa.LargeBinary(), nullable=True))
+            batch.add_column(sa.Column("duplicate_of", sa.Integer(), nullable=True))
+            batch.create_foreign_key("fk_jobs_duplicate_of_jobs", "jobs", ["duplicate_of"], ["id"])
+    create_index("ix_jobs_duplicate_of_posted_at", "jobs", ["duplicate_of", "posted_at"])
+
+    # Sign existing jobs in id order so the oldest posting in a cluster stays canonical
+    bind = op.get_bind()
+    jobs = sa.table("jobs", sa.column("id", sa.Integer), sa.column("description", sa.Text),
+                    sa.column("minhash", sa.LargeBinary), sa.column("duplicate_of", sa.Integer))
+    index = LSHIndex()
+    for job_id, description in bind.execute(
+            sa.select(jobs.c.id, jobs.c.description).where(jobs.c.minhash.is_(None)).order_by(jobs.c.id)).fetchall():
+        signature = minhash_signature(description)
+        if signature is None:
+            continue
+        duplicate_of = index.find_canonical(signature)
+        index.add(job_id, signature, duplicate_of)
+        bind.execute(jobs.update().where(jobs.c.id == job_id).values(
+            minhash=signature.tobytes(), duplicate_of=duplicate_of))
+
+
+def downgrade():
+    drop_index("ix_jobs_duplicate_of_posted_at", "jobs")
+    with op.batch_alter_table("jobs") as batch:
+        batch.drop_constraint("fk_jobs_duplicate_of_jobs", type_="foreignkey")
+        batch.drop_column("duplicate_of")
+        batch.drop_column("minhash")
@@ -0,0 +1,36 @@
+"""Offline match scores table
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.utils import has_table, create_index
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not has_table("match_scores"):
+        op.create_table(
+            "match_scores",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id")),
+            sa.Column("score", sa.Float()),
+            sa.Column("formula_version", sa.String()),
+            sa.Column("scored_at", sa.DateTime()),
+            sa.UniqueConstraint("user_id", "job_id", "formula_version",
+                                name="uq_match_scores_user_id_job_id_formula_version"),
+        )
+    create_index("ix_match_scores_id", "match_scores", ["id"])
+    create_index("ix_match_scores_formula_version_job_id", "match_scores", ["formula_version", "job_id"])
+
+
+def downgrade():
+    op.drop_table("match_scores")
@@ -0,0 +1,55 @@
+"""Per-user application analytics rollups
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.services.analytics_service import analytics_service
+from migrations.utils import has_table
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    created = False
+    if not has_table("application_status_counts"):
+        op.create_table(
+            "application_status_counts",
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+            sa.Column("status", sa.String(), primary_key=True),
+            sa.Column("count", sa.Integer()),
+        )
+        created = True
+    if not has_table("application_rollups"):
+        op.create_table(
+            "application_rollups",
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+            sa.Column("granularity", sa.String(), primary_key=True),
+            sa.Column("bucket_start", sa.Date(), primary_key=True),
+            sa.Column("applications", sa.Integer()),
+            sa.Column("score_sum", sa.Float()),
+            sa.Column("score_count", sa.Integer()),
+        )
+        created = True
+
+    # Backfill from existing applications. On a fresh install create_all already
+    # made the tables, but they may still be empty while applications exist.
+    bind = op.get_bind()
+    has_rollups = bind.execute(sa.text("SELECT 1 FROM application_status_counts LIMIT 1")).first()
+    has_applications = has_table("application_tracker") and bind.execute(
+        sa.text("SELECT 1 FROM application_tracker LIMIT 1")).first()
+    if (created or not has_rollups) and has_applications:
+        session = Session(bind=bind)
+        analytics_service.rebuild(session)
+
+
+def downgrade():
+    op.drop_table("application_rollups")
+    op.drop_table("application_status_counts")
@@ -0,0 +1,37 @@
+"""Recompute job coordinates with the region-aware gazetteer
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+
+0002 looked coordinates up by (city, country) alone, so e.g. "Portland, ME"
+got Portland, OR's. Re-parse every job that has coordinates and fix them.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.location_service import parse_location
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    jobs = sa.table("jobs", sa.column("id", sa.Integer), sa.column("location", sa.String),
+                    sa.column("latitude", sa.Float), sa.column("longitude", sa.Float))
+    rows = bind.execute(sa.select(jobs.c.id, jobs.c.location, jobs.c.latitude, jobs.c.longitude)
+                        .where(jobs.c.latitude.isnot(None))).fetchall()
+    for job_id, location, latitude, longitude in rows:
+        parsed = parse_location(location)
+        if (parsed.latitude, parsed.longitude) != (latitude, longitude):
+            bind.execute(jobs.update().where(jobs.c.id == job_id).values(
+                latitude=parsed.latitude, longitude=parsed.longitude,
+            ))
+
+
+def downgrade():
+    # Nothing to undo: the old coordinates were wrong
+    pass
@@ -0,0 +1,212 @@
+"""Score users x jobs offline and store the results in match_scores.
+
+Work is split into chunks of jobs and scored in a process pool; results are
+streamed back and written in batched upserts. Pairs already scored with the
+same formula version are skipped, so an interrupted run resumes where it left
+off. Bump SCORING_VERSION (or pass --formula-version) to backfill after a
+scoring change.
+
+    python rescore_matches.py                       # everyone x every job
+    python rescore_matches.py --users 1 2 --workers 4
+    python rescore_matches.py --since-job-id 500 --force
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from sqlalchemy import tuple_
+
+from app.database import SessionLocal, init_db
+from app.models.models import Job, Profile, MatchScore
+from app.services.matching_engine import MatchingEngine, SCORING_VERSION
+
+# Set in each worker process by _init_worker
+_engine = None
+_resumes = None
+
+
+def _prepare_resumes(resumes):
+    """Preprocess every resume once, in the parent, instead of once per worker or pair."""
+    engine = MatchingEngine()
+    return {
+        user_id: (engine.preprocess_text(text), set(engine.extract_skills(text)))
+        for user_id, text in resumes.items()
+    }
+
+
+def _init_worker(prepared_resumes):
+    global _engine, _resumes
+    _engine = MatchingEngine()
+    _resumes = prepared_resumes
+
+
+def _score_chunk(job_contents, pairs):
+    results = []
+    for user_id, job_id in pairs:
+        processed_resume, resume_skills = _resumes[user_id]
+        results.append((user_id, job_id, _engine._hybrid_score(processed_resume, resume_skills, job_contents[job_id])))
+    return results
+
+
+def _upsert(db, rows, formula_version):
+    """Insert or update scores in one statement where the dialect supports it."""
+    now = datetime.datetime.utcnow()
+    values = [{"user_id": u, "job_id": j, "score": s, "formula_version": formula_version, "scored_at": now}
+              for u, j, s in rows]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        statement = insert(MatchScore).values(values)
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "job_id", "formula_version"],
+            set_={"score": statement.excluded.score, "scored_at": statement.excluded.scored_at},
+        )
+        db.execute(statement)
+    else:
+        keys = [(u, j) for u, j, _ in rows]
+        db.query(MatchScore).filter(
+            MatchScore.formula_version == formula_version,
+            tuple_(MatchScore.user_id, MatchScore.job_id).in_(keys)
+        ).delete(synchronize_session=False)
+        db.bulk_insert_mappings(MatchScore, values)
+    db.commit()
+
+
+def _pending_pairs(db, user_ids, job_ids, formula_version, force, selected_users=None):
+    """Pairs in ``user_ids`` x ``job_ids`` without a score for ``formula_version``.
+
+    Only an explicit ``selected_users`` list (from --users) goes into the
+    query; otherwise every user with a resume is being scored, so the chunk's
+    job ids bound the lookup and no per-chunk IN list of all users is sent.
+    """
+    pairs = [(user_id, job_id) for job_id in job_ids for user_id in user_ids]
+    if force:
+        return pairs
+    done_query = db.query(MatchScore.user_id, MatchScore.job_id).filter(
+        MatchScore.formula_version == formula_version,
+        MatchScore.job_id.in_(job_ids)
+    )
+    if selected_users:
+        done_query = done_query.filter(MatchScore.user_id.in_(selected_users))
+    done = set(done_query.all())
+    return [pair for pair in pairs if pair not in done]
+
+
+def _format_eta(seconds):
+    return str(datetime.timedelta(seconds=int(seconds)))
+
+
+def rescore(user_ids=None, job_ids=None, since_job_id=None, workers=None, chunk_size=50,
+            batch_size=1000, formula_version=SCORING_VERSION, include_duplicates=False, force=False):
+    init_db()
+    db = SessionLocal()
+    try:
+        profile_query = db.query(Profile.user_id, Profile.resume_text).filter(Profile.resume_text.isnot(None))
+        if user_ids:
+            profile_query = profile_query.filter(Profile.user_id.in_(user_ids))
+        resumes = {user_id: text for user_id, text in profile_query.all() if text}
+
+        job_query = db.query(Job.id).order_by(Job.id)
+        if job_ids:
+            job_query = job_query.filter(Job.id.in_(job_ids))
+        if since_job_id is not None:
+            job_query = job_query.filter(Job.id > since_job_id)
+        if not include_duplicates:
+            job_query = job_query.filter(Job.duplicate_of.is_(None))
+        all_job_ids = [job_id for (job_id,) in job_query.all()]
+
+        if not resumes or not all_job_ids:
+            print("Nothing to score: need at least one resume and one job.")
+            return 0
+
+        total = len(resumes) * len(all_job_ids)
+        chunks = [all_job_ids[i:i + chunk_size] for i in range(0, len(all_job_ids), chunk_size)]
+        workers = workers or os.cpu_count() or 1
+        print(f"Scoring {len(resumes)} users x {len(all_job_ids)} jobs = {total} pairs "
+              f"({formula_version}, {workers} workers, {len(chunks)} chunks)")
+
+        start = time.perf_counter()
+        last_report = start
+        scored = skipped = 0
+        buffer = []
+
+        prepared_resumes = _prepare_resumes(resumes)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(prepared_resumes,)) as pool:
+            in_flight = set()
+            chunk_iter = iter(chunks)
+
+            def submit_next():
+                # Skip chunks that are already fully scored; stop when one is submitted
+                nonlocal skipped
+                for chunk in chunk_iter:
+                    pairs = _pending_pairs(db, list(resumes), chunk, formula_version, force, user_ids)
+                    skipped += len(resumes) * len(chunk) - len(pairs)
+                    if not pairs:
+                        continue
+                    job_contents = {job_id: f"{skills} {description}" for job_id, skills, description in
+                                    db.query(Job.id, Job.skills_required, Job.description).filter(Job.id.in_(chunk)).all()}
+                    in_flight.add(pool.submit(_score_chunk, job_contents, pairs))
+                    return True
+                return False
+
+            # Keep a bounded number of chunks queued so memory stays flat
+            while len(in_flight) < workers * 2 and submit_next():
+                pass
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    in_flight.discard(future)
+                    results = future.result()
+                    buffer.extend(results)
+                    scored += len(results)
+                    submit_next()
+
+                if len(buffer) >= batch_size or not in_flight:
+                    if buffer:
+                        _upsert(db, buffer, formula_version)
+                        buffer = []
+
+                now = time.perf_counter()
+                if now - last_report >= 5 or not in_flight:
+                    elapsed = now - start
+                    rate = scored / elapsed if elapsed else 0.0
+                    remaining = total - scored - skipped
+                    eta = _format_eta(remaining / rate) if rate else "?"
+                    print(f"  {scored + skipped}/{total} pairs ({skipped} already scored) "
+                          f"{rate:.1f} pairs/s, ETA {eta}")
+                    last_report = now
+
+        elapsed = time.perf_counter() - start
+        print(f"Done: scored {scored} pairs in {elapsed:.1f}s ({scored / max(elapsed, 1e-9):.1f} pairs/s), "
+              f"skipped {skipped}")
+        return scored
+    finally:
+        db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, nargs="+", help="only score these user ids")
+    parser.add_argument("--jobs", type=int, nargs="+", help="only score these job ids")
+    parser.add_argument("--since-job-id", type=int, help="only score jobs with a larger id")
+    parser.add_argument("--workers", type=int, help="process pool size (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=50, help="jobs per worker task")
+    parser.add_argument("--batch-size", type=int, default=1000, help="scores per database write")
+    parser.add_argument("--formula-version", default=SCORING_VERSION)
+    parser.add_argument("--include-duplicates", action="store_true", help="also score near-duplicate jobs")
+    parser.add_argument("--force", action="store_true", help="rescore pairs that already have a score")
+    args = parser.parse_args(argv)
+    rescore(args.users, args.jobs, args.since_job_id, args.workers, args.chunk_size, args.batch_size,
+            args.formula_version, args.include_duplicates, args.force)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.database import SessionLocal, init_db
 from app.models.models import Job
+from app.services.job_service import job_service
 from datetime import datetime
 
 def seed_jobs():
@@ -59,10 +60,9 @@ def seed_jobs():
         # Check if already exists to avoid duplicates
         existing = db.query(Job).filter(Job.title == job_data["title"], Job.company == job_data["company"]).first()
         if not existing:
-            job = Job(**job_data)
-            db.add(job)
+            # Near-duplicate reposts are stored but linked to their canonical posting
+            job_service.add_job(db, **job_data)
     
-    db.commit()
     db.close()
     print("Database seeded with mock jobs!")
 
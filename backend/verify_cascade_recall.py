@@ -0,0 +1,53 @@
+"""Report how well cascade ranking recovers the exhaustive top-k.
+
+For every user with a resume, ranks the whole catalog exhaustively and with
+the two-stage cascade exactly as /recommendations runs it (snapshot stage
+one, including delta and skill-less jobs), then prints recall@k and the time
+each took. Publishes a corpus snapshot first if none exists.
+
+    python verify_cascade_recall.py [top_k] [candidate_k ...]
+"""
+import sys
+
+from app.database import SessionLocal
+from app.models.models import Job, Profile
+from app.services.corpus_snapshot import build_snapshot
+from app.services.matching_engine import matching_engine, CASCADE_CANDIDATES
+from app.services.recommendation_service import recommendation_service
+
+
+def verify(top_k=10, candidate_sizes=(CASCADE_CANDIDATES,)):
+    db = SessionLocal()
+    try:
+        profiles = db.query(Profile.user_id, Profile.resume_text).filter(Profile.resume_text.isnot(None)).all()
+        num_jobs = db.query(Job.id).count()
+        if not profiles or not num_jobs:
+            print("ERROR: need at least one resume and one job in the database.")
+            return
+
+        if recommendation_service.snapshots.current() is None:
+            print("No corpus snapshot published; building one")
+            build_snapshot(db, matching_engine, recommendation_service.snapshots.root)
+
+        print(f"{num_jobs} jobs, {len(profiles)} resumes, top_k={top_k}\n")
+        for candidate_k in candidate_sizes:
+            recalls, exhaustive_ms, cascade_ms = [], 0.0, 0.0
+            for user_id, resume_text in profiles:
+                report = recommendation_service.cascade_recall(db, resume_text, top_k, candidate_k)
+                recalls.append(report["recall"])
+                exhaustive_ms += report["exhaustive_ms"]
+                cascade_ms += report["cascade_ms"]
+                missed = ({job_id for job_id, score in report["exhaustive"] if score > 0}
+                          - {job_id for job_id, _ in report["cascade"]})
+                print(f"  candidates={candidate_k} user {user_id}: recall@{top_k}={report['recall']:.2f} "
+                      f"exhaustive={report['exhaustive_ms']:.0f}ms cascade={report['cascade_ms']:.0f}ms "
+                      f"missed={sorted(missed)}")
+            print(f"candidates={candidate_k}: mean recall@{top_k}={sum(recalls) / len(recalls):.3f}, "
+                  f"speedup={exhaustive_ms / max(cascade_ms, 1e-9):.1f}x\n")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    verify(args[0] if args else 10, args[1:] or (CASCADE_CANDIDATES,))
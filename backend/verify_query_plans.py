@@ -0,0 +1,100 @@
+"""Fail if any JobService query shape falls back to a full table scan.
+
+Runs EXPLAIN QUERY PLAN (SQLite) or EXPLAIN (PostgreSQL) for every combination
+of /jobs filters plus the per-id and per-user lookups. Any SCAN counts, even
+one in index order (``SCAN jobs USING INDEX ix_jobs_posted_at`` still visits
+every row), and so does a search bounded only by ``duplicate_of IS NULL``,
+which matches nearly every row. Only shapes with no indexable filter at all
+(no filters, or free-text keywords alone) are allowed to scan. By default it
+checks a fresh SQLite database; set DATABASE_URL to check another one.
+
+    python verify_query_plans.py
+"""
+import itertools
+import os
+import sys
+import tempfile
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "plans.db")
+
+from sqlalchemy import text
+
+from app.database import SessionLocal, init_db
+from app.models.models import Job, Profile
+from app.services.job_service import job_service
+
+LOCATIONS = [None, "New York, NY", "TX", "Kenya", "Smallville", "Remote"]
+REMOTE_STATUSES = [None, "Remote"]
+EXPERIENCE_LEVELS = [None, "Senior"]
+KEYWORDS = [None, "python, aws"]
+
+
+def query_shapes(db):
+    for location, remote_status, experience_level, keywords in itertools.product(
+            LOCATIONS, REMOTE_STATUSES, EXPERIENCE_LEVELS, KEYWORDS):
+        label = (f"get_jobs(location={location!r}, remote_status={remote_status!r}, "
+                 f"experience_level={experience_level!r}, keywords={keywords!r})")
+        # Keywords are a free-text LIKE, so without another filter a scan is unavoidable
+        may_scan = location is None and remote_status is None and experience_level is None
+        yield label, job_service.build_jobs_query(db, location, remote_status, experience_level, keywords), may_scan
+    yield ("get_jobs(location='Austin, TX', radius_km=50)",
+           job_service.build_jobs_query(db, "Austin, TX", radius_km=50), False)
+    yield "get_jobs(include_duplicates=True)", job_service.build_jobs_query(db, include_duplicates=True), True
+    yield "get_job_by_id(1)", job_service.build_job_by_id_query(db, 1), False
+    yield "profile by user_id", db.query(Profile).filter(Profile.user_id == 1), False
+
+
+def explain(db, query):
+    dialect = db.get_bind().dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "sqlite":
+        rows = db.execute(text("EXPLAIN QUERY PLAN " + sql)).fetchall()
+        plan = [row[-1] for row in rows]
+        # SEARCH is bounded by an index condition; every SCAN (even "USING INDEX") walks the table
+        full_scans = [step for step in plan if step.startswith("SCAN") or step.endswith("(duplicate_of=?)")]
+    else:
+        # Tiny test tables make the planner prefer sequential scans regardless of indexes
+        db.execute(text("SET enable_seqscan = off"))
+        plan = [row[0] for row in db.execute(text("EXPLAIN " + sql)).fetchall()]
+        # An index scan without an Index Cond (other than the dedup filter) is a full walk in index order
+        bounded = any("Index Cond" in step and not step.strip().endswith("Index Cond: (duplicate_of IS NULL)")
+                      for step in plan)
+        full_scans = [step for step in plan if "Seq Scan" in step or ("Scan" in step and "Index" in step and not bounded)]
+    return plan, full_scans
+
+
+SAMPLE_LOCATIONS = ["New York, NY", "Austin, TX", "Dallas, TX", "Nairobi, Kenya", "Remote"]
+
+
+def verify():
+    init_db()
+    db = SessionLocal()
+    failures = 0
+    try:
+        if not db.query(Job.id).first():
+            db.add_all(Job(title=f"Sample {i}", company="Sample", location=location)
+                       for i, location in enumerate(SAMPLE_LOCATIONS))
+            db.commit()
+        for label, query, may_scan in query_shapes(db):
+            plan, full_scans = explain(db, query)
+            if not full_scans:
+                status = "ok"
+            else:
+                status = "scan (expected)" if may_scan else "FULL SCAN"
+            print(f"[{status}] {label}")
+            for step in plan:
+                print(f"    {step}")
+            failures += bool(full_scans) and not may_scan
+    finally:
+        db.close()
+
+    if failures:
+        print(f"\n{failures} query shape(s) fall back to a full table scan")
+        return 1
+    print("\nAll query shapes use an index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(verify())
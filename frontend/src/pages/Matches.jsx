@@ -10,13 +10,15 @@ function Matches() {
         const fetchMatches = async () => {
             setLoading(true);
             try {
-                const [jobs, user] = await Promise.all([
-                    jobService.getJobs({}),
+                // One ranked request instead of a /match per job in the catalog;
+                // only the cards shown need the full skill breakdown
+                const [recommendations, user] = await Promise.all([
+                    jobService.getRecommendations({ top_k: 3 }),
                     authService.getMe()
                 ]);
 
                 if (user.profile?.resume_text) {
-                    const matchPromises = jobs.map(async (job) => {
+                    const matchPromises = recommendations.map(async (job) => {
                         const formData = new FormData();
                         formData.append('resume_text', user.profile.resume_text);
                         formData.append('job_id', job.id);
@@ -27,8 +29,7 @@ function Matches() {
                     const results = await Promise.all(matchPromises);
                     const sorted = results
                         .filter(r => r.match_percentage > 0)
-                        .sort((a, b) => b.match_percentage - a.match_percentage)
-                        .slice(0, 3);
+                        .sort((a, b) => b.match_percentage - a.match_percentage);
                     setMatches(sorted);
                 }
             } catch (error) {
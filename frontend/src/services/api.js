@@ -13,6 +13,24 @@ api.interceptors.request.use((config) => {
     return config;
 });
 
+const MAX_RETRIES = 3;
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+// Requests shed by admission control (429/503) are retried after the server's Retry-After
+api.interceptors.response.use(undefined, async (error) => {
+    const { config, response } = error;
+    if (!config || !response || ![429, 503].includes(response.status)) {
+        throw error;
+    }
+    config.retryCount = (config.retryCount || 0) + 1;
+    if (config.retryCount > MAX_RETRIES) {
+        throw error;
+    }
+    const retryAfter = Number(response.headers['retry-after']) || 1;
+    await sleep(retryAfter * 1000);
+    return api(config);
+});
+
 export const authService = {
     register: (data) => api.post('/register', data).then(res => res.data),
     login: (formData) => api.post('/login', formData, {
@@ -26,8 +44,11 @@ export const authService = {
 export const jobService = {
     getJobs: (params) => api.get('/jobs', { params: { ...params, t: Date.now() } }).then(res => res.data),
     matchResume: (formData) => api.post('/match', formData).then(res => res.data),
+    getRecommendations: (params) => api.get('/recommendations', { params: { ...params, t: Date.now() } }).then(res => res.data),
     tailorResume: (formData) => api.post('/tailor-resume', formData).then(res => res.data),
     generateCoverLetter: (formData) => api.post('/generate-cover-letter', formData).then(res => res.data),
+    tailorResumeBatch: (data) => api.post('/tailor-resume/batch', data).then(res => res.data),
+    generateCoverLetterBatch: (data) => api.post('/generate-cover-letter/batch', data).then(res => res.data),
 };
 
 export const trackerService = {